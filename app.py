@@ -3,9 +3,15 @@ Executive Fiscal ROI Dashboard — SNAP Payment Error Rate & Income Latency Moni
 Streamlit app for Databricks; uses gold_snap_* and gold_income_latency_timeseries.
 """
 import os
-import streamlit as st
-import plotly.graph_objects as go
-import pandas as pd
+
+# Standard library only: starts the startup clock before the heavy imports below.
+import dashboard_startup as startup
+
+with startup.phase("import.streamlit"):
+    import streamlit as st
+with startup.phase("import.pandas"):
+    import numpy as np
+    import pandas as pd
 
 # Must be first Streamlit command
 st.set_page_config(
@@ -15,27 +21,23 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Data layer (mock vs real from env)
-import dashboard_data as data
+# Data layer (backend resolved on first use; with background refresh its prefetch starts here)
+with startup.phase("import.data_layer"):
+    import dashboard_data as data
 
-# Event dates for chart markers
-INGESTION_CHANGE_DATE = "2025-12-03"
-REMEDIATION_DATE = "2026-01-12"
-PER_THRESHOLD = 6.0
 TARGET_PER_DEFAULT = 5.8
+# Simulator curve: the slider range at 0.01pp, answered in one batch call
+SCENARIO_GRID = np.round(np.arange(4.0, 8.001, 0.01), 2)
+# Regions preselected when comparison mode opens
+COMPARE_DEFAULT = 4
 
-# Dark theme: plotly layout
-CHART_LAYOUT = dict(
-    template="plotly_dark",
-    paper_bgcolor="rgba(0,0,0,0)",
-    plot_bgcolor="rgba(0,0,0,0)",
-    font=dict(color="#e0e0e0", size=12),
-    margin=dict(l=50, r=30, t=40, b=50),
-    xaxis=dict(showgrid=True, gridcolor="rgba(128,128,128,0.3)"),
-    yaxis=dict(showgrid=True, gridcolor="rgba(128,128,128,0.3)"),
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-    hovermode="x unified",
-)
+
+def charts():
+    # Chart builders (memoized on frame content). Plotly is imported on first use, after the first render
+    # has submitted its panel queries, so the import overlaps the data fetch instead of preceding it.
+    with startup.phase("import.charts"):
+        import dashboard_charts
+    return dashboard_charts
 
 
 def apply_dark_css():
@@ -51,34 +53,14 @@ def apply_dark_css():
     """, unsafe_allow_html=True)
 
 
-def main():
-    apply_dark_css()
-
-    # Region selector (top right area)
-    regions = data.get_regions()
-    col_title, col_live, col_region = st.columns([2, 1, 1])
-    with col_title:
-        st.title("Executive Fiscal ROI")
-        st.caption("SNAP Payment Error Rate & Income Latency Monitoring.")
-    with col_live:
-        st.markdown("**Live Data** · **Databricks Connected**")
-    with col_region:
-        region = st.selectbox("Region", regions, key="region", label_visibility="collapsed")
-        st.caption("Region breakdown")
-
-    # KPIs (scale PER from decimal to % if table stores 0.06 = 6%)
-    kpi = data.get_kpi_summary(region if region != "All" else None)
-    current_per = float(kpi["current_per"])
-    delta_pp = float(kpi["per_delta_pp"])
-    if 0 < current_per < 1:
-        current_per = current_per * 100
-        delta_pp = delta_pp * 100
+def render_kpis(kpi: dict):
+    # KPIs arrive in display units (PER in %) from the data layer
     c1, c2, c3, c4 = st.columns(4)
     with c1:
         st.metric(
             "CURRENT PER RATE",
-            f"{current_per:.1f}%",
-            f"{delta_pp:+.2f}pp",
+            f"{kpi['current_per']:.1f}%",
+            f"{kpi['per_delta_pp']:+.2f}pp",
             delta_color="inverse",
         )
         st.caption("Target: 5.8%")
@@ -104,125 +86,126 @@ def main():
             "Cumulative identified.",
         )
 
-    st.divider()
 
-    # Charts row
-    per_df = data.get_per_timeseries(region if region != "All" else None)
-    lat_df = data.get_income_latency_timeseries(region if region != "All" else None)
+def render_diagnostics():
+    # Hidden panel (?diagnostics=1 with SNAP_TRACE=true): span breakdown of the previous full render.
+    renders = data.recent_renders()
+    with st.expander("Diagnostics", expanded=True):
+        if not renders:
+            st.caption("No traced render yet; rerun the page.")
+            return
+        last = renders[-1]
+        st.caption(f"Last render: {last['total_ms']:.1f} ms, {len(last['spans'])} spans.")
+        st.dataframe(pd.DataFrame(last["spans"]), use_container_width=True, hide_index=True)
+    with st.expander("Startup"):
+        report = startup.startup_report()
+        st.caption(f"Process up {report['elapsed_ms'] / 1000:.1f} s.")
+        st.dataframe(pd.DataFrame(report["phases"]), use_container_width=True, hide_index=True)
+
+
+def _switch_backend():
+    data.set_backend(st.session_state["backend"])
+
+
+def render_backend_switch():
+    # Demo/ops only (SNAP_BACKEND_SWITCH=true): the backend is process-wide, so this affects every session.
+    if st.session_state.get("backend") != data.backend_name():
+        st.session_state["backend"] = data.backend_name()
+    st.selectbox("Backend", list(data.BACKENDS), key="backend", on_change=_switch_backend)
+
+
+def render_per_chart(per_df: pd.DataFrame, x_range=None):
+    st.subheader("PER Rate Trend")
+    st.caption("Federal threshold at 6%.")
+    if not per_df.empty:
+        st.plotly_chart(charts().per_chart(per_df, x_range=x_range), use_container_width=True)
+        with st.expander("PER data check"):
+            st.caption("Columns: " + ", ".join(per_df.columns.tolist()))
+            st.dataframe(per_df.head(10), use_container_width=True)
+    else:
+        st.info("No PER time series data.")
+
+
+def render_latency_chart(lat_df: pd.DataFrame, x_range=None):
+    st.subheader("Wage Ingestion Latency")
+    st.caption("Median & P90 processing days.")
+    if not lat_df.empty:
+        st.plotly_chart(charts().latency_chart(lat_df, x_range=x_range), use_container_width=True)
+    else:
+        st.info("No latency time series data.")
+
+
+@st.fragment
+def render_charts(per_df: pd.DataFrame, lat_df: pd.DataFrame, per_err: str | None, lat_err: str | None):
+    # Fragment: moving the chart window reruns only the charts, not the data fetch or KPIs.
+    # Long series are downsampled to the chart's point budget; a date window restores detail.
+    x_range = None
+    long_frames = [df for df in (per_df, lat_df) if not df.empty and charts().needs_window(df)]
+    if long_frames:
+        months = pd.concat([df["month_start"] for df in long_frames])
+        lo, hi = months.min().date(), months.max().date()
+        x_range = st.slider("Chart window", min_value=lo, max_value=hi, value=(lo, hi), key="chart_window")
+        st.caption("Long series are downsampled; narrow the window for full resolution.")
 
     chart_col1, chart_col2 = st.columns(2)
 
-    with chart_col1:
-        st.subheader("PER Rate Trend")
-        st.caption("Federal threshold at 6%.")
-        if not per_df.empty:
-            per_df = per_df.copy()
-            # Resolve rate column (table may have "per_rate" or ".00 per_rate" etc.)
-            rate_col = "per_rate"
-            if rate_col not in per_df.columns:
-                candidates = [c for c in per_df.columns if "per_rate" in str(c).lower()]
-                rate_col = candidates[0] if candidates else None
-            if rate_col is None:
-                st.warning("PER table missing column `per_rate`. Columns: " + ", ".join(per_df.columns.tolist()))
-            else:
-                per_df["per_rate"] = pd.to_numeric(per_df[rate_col], errors="coerce").fillna(0)
-                # Table stores decimal (0.06255 = 6.255%) — scale to % for chart
-                if per_df["per_rate"].max() > 0 and per_df["per_rate"].max() < 1:
-                    per_df["per_rate"] = per_df["per_rate"] * 100
-                per_df["month_start"] = pd.to_datetime(per_df["month_start"])
-                if per_df["month_start"].dt.tz is not None:
-                    per_df["month_start"] = per_df["month_start"].dt.tz_convert("UTC").dt.tz_localize(None)
-                # Use list of dates to avoid pandas Timestamp + int in Plotly
-                x_vals = per_df["month_start"].dt.to_pydatetime()
-                fig_per = go.Figure()
-                fig_per.add_trace(
-                    go.Scatter(
-                        x=x_vals,
-                        y=per_df["per_rate"].tolist(),
-                        mode="lines",
-                        name="PER %",
-                        line=dict(color="#3b82f6", width=2),
-                    )
-                )
-                fig_per.add_hline(
-                    y=PER_THRESHOLD,
-                    line_dash="dash",
-                    line_color="red",
-                    annotation_text="Above Threshold",
-                    annotation_position="top right",
-                )
-                fig_per.update_layout(**CHART_LAYOUT)
-                fig_per.update_yaxes(title="%", range=[0, None])
-                fig_per.update_xaxes(title="")
-                st.plotly_chart(fig_per, use_container_width=True)
-                with st.expander("PER data check"):
-                    st.caption("Columns: " + ", ".join(per_df.columns.tolist()))
-                    st.dataframe(per_df.head(10), use_container_width=True)
+    with chart_col1, data.span("ui.per_chart"):
+        if per_err:
+            st.subheader("PER Rate Trend")
+            st.warning(f"PER data unavailable ({per_err}).")
         else:
-            st.info("No PER time series data.")
-
-    with chart_col2:
-        st.subheader("Wage Ingestion Latency")
-        st.caption("Median & P90 processing days.")
-        if not lat_df.empty:
-            lat_df = lat_df.copy()
-            lat_df["month_start"] = pd.to_datetime(lat_df["month_start"])
-            # Normalize to naive so we can compare with date markers (avoid offset-naive vs offset-aware)
-            if lat_df["month_start"].dt.tz is not None:
-                lat_df["month_start"] = lat_df["month_start"].dt.tz_convert("UTC").dt.tz_localize(None)
-            # Use list of dates to avoid pandas Timestamp + int in Plotly
-            x_vals = lat_df["month_start"].dt.to_pydatetime()
-            x_min = lat_df["month_start"].min().to_pydatetime()
-            x_max = lat_df["month_start"].max().to_pydatetime()
-            fig_lat = go.Figure()
-            fig_lat.add_trace(
-                go.Scatter(
-                    x=x_vals,
-                    y=lat_df["median_latency_days"].tolist(),
-                    mode="lines",
-                    name="Median",
-                    line=dict(color="#3b82f6", width=2),
-                )
-            )
-            fig_lat.add_trace(
-                go.Scatter(
-                    x=x_vals,
-                    y=lat_df["p90_latency_days"].tolist(),
-                    mode="lines",
-                    name="P90",
-                    line=dict(color="#a855f7", width=2, dash="dash"),
-                )
-            )
-            # Vertical lines: ingestion change & remediation (add_shape to avoid add_vline mean/sum on mixed types)
-            y_max_lat = max(lat_df["median_latency_days"].max(), lat_df["p90_latency_days"].max())
-            for label, date_str in [
-                ("Ingestion change", INGESTION_CHANGE_DATE),
-                ("Remediation", REMEDIATION_DATE),
-            ]:
-                d = pd.Timestamp(date_str).to_pydatetime()
-                if x_min <= d <= x_max:
-                    fig_lat.add_shape(
-                        type="line",
-                        x0=d, x1=d,
-                        y0=0, y1=y_max_lat,
-                        xref="x", yref="y",
-                        line=dict(color="orange", dash="dot", width=1.5),
-                    )
-                    fig_lat.add_annotation(
-                        x=d, y=y_max_lat, yref="y", xref="x",
-                        text=label, showarrow=False,
-                        yanchor="bottom", font=dict(size=10, color="orange"),
-                    )
-            fig_lat.update_layout(**CHART_LAYOUT)
-            fig_lat.update_yaxes(title="Days", range=[0, None])
-            fig_lat.update_xaxes(title="")
-            st.plotly_chart(fig_lat, use_container_width=True)
+            render_per_chart(per_df, x_range)
+
+    with chart_col2, data.span("ui.latency_chart"):
+        if lat_err:
+            st.subheader("Wage Ingestion Latency")
+            st.warning(f"Latency data unavailable ({lat_err}).")
         else:
-            st.info("No latency time series data.")
+            render_latency_chart(lat_df, x_range)
 
-    st.divider()
 
-    # Scenario Simulator
+@st.fragment
+def render_comparison(options: list[str]):
+    # Fragment: changing the selection reruns only this section. All selected regions come from one
+    # grouped read of the region store, and their KPIs from one groupby, however many are picked.
+    st.subheader("Region Comparison")
+    selected = st.multiselect("Regions", options, default=options[:COMPARE_DEFAULT], key="compare_regions")
+    if not selected:
+        st.info("Select regions to compare.")
+        return
+    try:
+        comparison = data.get_region_comparison(selected)
+    except Exception as exc:
+        st.warning(f"Comparison data unavailable ({exc}).")
+        return
+    kpi = comparison["kpi"]
+    st.dataframe(
+        pd.DataFrame({
+            "PER %": kpi["current_per"].round(1),
+            "Change (pp)": kpi["per_delta_pp"].round(2),
+            "Benefits ($M)": (kpi["benefits_issued_usd"] / 1e6).round(1),
+            "Overpayment ($M)": (kpi["total_overpayment_usd"] / 1e6).round(1),
+            "Median latency (d)": kpi["median_latency_days"],
+            "P90 latency (d)": kpi["p90_latency_days"],
+        }),
+        use_container_width=True,
+    )
+    lib = charts()
+    if not comparison["per"].empty:
+        st.plotly_chart(
+            lib.small_multiples(comparison["per"], "per_rate", "PER %", threshold=lib.PER_THRESHOLD),
+            use_container_width=True,
+        )
+    if not comparison["latency"].empty:
+        st.plotly_chart(
+            lib.small_multiples(comparison["latency"], "median_latency_days", "Median latency (days)"),
+            use_container_width=True,
+        )
+
+
+@st.fragment
+def render_simulator(scenario_future, deadline: float):
+    # Fragment: slider moves rerun only this section; the scenario is interpolated in-process.
     st.subheader("Scenario Simulator")
     st.caption("Adjust target PER rate to see projected penalty exposure.")
     target_per = st.slider(
@@ -234,7 +217,17 @@ def main():
         format="%.1f%%",
         key="target_per",
     )
-    scenario = data.get_roi_scenario(target_per)
+    # The prefetch belongs to the last full page run: use it only if it succeeded for this slider value.
+    # Otherwise (slider moved, or the prefetch failed or timed out) compute the scenario again on this
+    # rerun, behind its own panel budget, so a past failure is retried and a new one degrades the panel.
+    scenario, scenario_err = data.panel_result(scenario_future, None, deadline)
+    if scenario is None or scenario["target_per"] != target_per:
+        scenario, scenario_err = data.panel_result(
+            data.submit(data.get_roi_scenario, target_per), None, data.panel_deadline()
+        )
+    if scenario is None:
+        st.warning(f"Scenario data unavailable ({scenario_err}).")
+        return
     sim_c1, sim_c2, sim_c3 = st.columns(3)
     with sim_c1:
         st.metric("Target Rate", f"{target_per:.1f}%", "")
@@ -253,6 +246,71 @@ def main():
     st.caption("Target PER 5.8% by 2026-03.")
     if not scenario["below_threshold"]:
         st.warning("Target is at or above federal 6% threshold.")
+    with data.span("ui.scenario_chart"):
+        curve = data.get_roi_scenarios(SCENARIO_GRID)
+        st.plotly_chart(charts().scenario_chart(curve, target_per), use_container_width=True)
+
+
+def main():
+    # One trace per full render (SNAP_TRACE=true): timings of every data, cache and chart step.
+    with data.render_trace("render"), startup.phase("first_render"):
+        _render_page()
+    startup.finish()
+    if data.trace_enabled() and st.query_params.get("diagnostics"):
+        with st.sidebar:
+            render_diagnostics()
+
+
+def _render_page():
+    apply_dark_css()
+
+    # Submit all independent panel queries up front (region/target from the previous run's widgets),
+    # then await each panel as it renders; a slow or failing table only degrades its own panel.
+    selected = st.session_state.get("region", "All")
+    region_arg = selected if selected != "All" else None
+    target_state = float(st.session_state.get("target_per", TARGET_PER_DEFAULT))
+    panels = data.submit_panels(region_arg, target_state)
+    deadline = data.panel_deadline()
+    with data.span("ui.await_regions"):
+        regions, regions_err = data.panel_result(panels["regions"], ["All"], deadline)
+
+    # Region selector (top right area)
+    col_title, col_live, col_region = st.columns([2, 1, 1])
+    with col_title:
+        st.title("Executive Fiscal ROI")
+        st.caption("SNAP Payment Error Rate & Income Latency Monitoring.")
+    with col_live:
+        st.markdown("**Live Data** · **Databricks Connected**")
+    with col_region:
+        st.selectbox("Region", regions, key="region", label_visibility="collapsed")
+        st.caption("Region breakdown" if regions_err is None else f"Regions unavailable ({regions_err}).")
+        compare = st.toggle("Compare regions", key="compare")
+
+    with data.span("ui.await_series"):
+        per_df, per_err = data.panel_result(panels["per"], pd.DataFrame(), deadline)
+        lat_df, lat_err = data.panel_result(panels["latency"], pd.DataFrame(), deadline)
+
+    with data.span("ui.kpis"):
+        if per_err or lat_err:
+            st.warning(f"KPIs unavailable: {per_err or lat_err}")
+        else:
+            render_kpis(data.kpi_from_frames(per_df, lat_df))
+
+    st.divider()
+
+    # Charts row
+    render_charts(per_df, lat_df, per_err, lat_err)
+
+    st.divider()
+
+    if compare:
+        with data.span("ui.comparison"):
+            render_comparison([r for r in regions if r != "All"])
+        st.divider()
+
+    # Scenario Simulator
+    with data.span("ui.simulator"):
+        render_simulator(panels["scenario"], deadline)
 
     # Sidebar: data source indicator
     with st.sidebar:
@@ -262,10 +320,15 @@ def main():
         - **gold_snap_roi_scenarios**
         - **gold_income_latency_timeseries**
         """)
-        if os.getenv("USE_MOCK_BACKEND", "true").lower() == "true":
+        backend = data.backend_name()
+        if backend == "mock":
             st.info("Using **mock** data (local).")
+        elif backend == "local":
+            st.info("Using **local** Parquet snapshots (DuckDB).")
         else:
             st.success("**Live** Databricks data.")
+        if os.getenv("SNAP_BACKEND_SWITCH", "false").lower() == "true":
+            render_backend_switch()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+"""
+Benchmark: single-flight coalescing in dashboard_data_real.SqlBackend.
+N sessions request the same registry query at once against a fake connection that takes --delay seconds
+per execution; reports warehouse executions, coalesced calls, wall time, and that every caller got the
+same result (or the same error with --fail). No Databricks needed.
+
+    python benchmarks/bench_coalescing.py --sessions 50 --delay 0.5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard_data_real import ConnectionPool, SqlBackend  # noqa: E402
+
+
+class SlowCursor:
+    """Sleeps `delay` per execute and serves a small PER-shaped result; raises on execute if `fail`."""
+
+    def __init__(self, owner):
+        self._owner = owner
+        self.description = None
+
+    def execute(self, query, params=None):
+        with self._owner.lock:
+            self._owner.executions += 1
+        time.sleep(self._owner.delay)
+        if self._owner.fail:
+            raise RuntimeError("warehouse error (simulated)")
+        self.description = [("month_start",), ("region",), ("per_rate",), ("overpayment_usd",), ("issued_benefits_usd",)]
+
+    def fetchall(self):
+        return [(pd.Timestamp("2026-01-01"), "Region A", 0.061, 1.0e6, 2.0e7)]
+
+    def close(self):
+        pass
+
+
+class SlowConnection:
+    def __init__(self, delay: float, fail: bool):
+        self.delay = delay
+        self.fail = fail
+        self.executions = 0
+        self.lock = threading.Lock()
+
+    def cursor(self):
+        return SlowCursor(self)
+
+    def close(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.5, help="seconds per warehouse execution")
+    parser.add_argument("--fail", action="store_true", help="every execution raises")
+    args = parser.parse_args()
+
+    conn = SlowConnection(args.delay, args.fail)
+    backend = SqlBackend(ConnectionPool(lambda: conn, size=args.sessions))
+    results, errors = [], []
+    barrier = threading.Barrier(args.sessions)
+
+    def session():
+        barrier.wait()
+        try:
+            results.append(backend.get_per_timeseries("Region A"))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=session) for _ in range(args.sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    stats = backend.get_query_stats()["per_timeseries"]
+    print(f"sessions={args.sessions} delay={args.delay}s wall={wall:.2f}s")
+    print(f"warehouse executions={conn.executions} calls={stats['calls']} coalesced={stats['coalesced']} "
+          f"errors={stats['errors']}")
+    if results:
+        print(f"results={len(results)} identical={all(r is results[0] for r in results)}")
+    if errors:
+        print(f"errors raised={len(errors)} messages={sorted({str(e) for e in errors})}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark: public dashboard_data functions and headless app renders against a local warehouse stand-in.
+Runs the local backend (dashboard_data_local: the warehouse registry SQL on DuckDB) over Parquet snapshots
+of synthetic gold tables (regions x years at weekly grain); no Databricks needed. Needs `pip install duckdb`.
+
+    python benchmarks/bench_dashboard.py --regions 20 --years 10
+    python benchmarks/bench_dashboard.py --no-region-store --json results.json
+
+Reports p50/p95 latency per call, warehouse queries per call/render, and peak RSS growth. Every case runs
+in a fresh process, so "peak MB" is how far the process's peak RSS rose above its post-import peak during
+the case: DuckDB and Arrow buffers included, earlier cases excluded.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _queries(data) -> int:
+    return sum(s["calls"] for s in data.get_query_stats().values())
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _pct(samples: list[float], q: float) -> float:
+    return float(np.percentile(samples, q)) * 1000 if samples else float("nan")
+
+
+def _timed(fn, calls: list[tuple], data) -> dict:
+    """Run fn over calls; p50/p95 ms, warehouse queries per call and peak RSS growth (MB) over the pass."""
+    samples = []
+    q0 = _queries(data)
+    peak0 = _peak_rss_mb()
+    for args in calls:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    queries = (_queries(data) - q0) / max(1, len(calls))
+    return {"p50_ms": _pct(samples, 50), "p95_ms": _pct(samples, 95), "queries": queries,
+            "peak_mb": _peak_rss_mb() - peak0}
+
+
+_TARGETS = np.round(np.arange(4.0, 8.01, 0.1), 1)
+
+# Case -> (dashboard_data function, calls for the region list); each runs in its own process.
+CASES = {
+    "get_regions": ("get_regions", lambda regions: [()]),
+    "get_per_timeseries": ("get_per_timeseries", lambda regions: [(r,) for r in regions]),
+    "get_income_latency_timeseries": ("get_income_latency_timeseries", lambda regions: [(r,) for r in regions]),
+    "get_kpi_summary": ("get_kpi_summary", lambda regions: [(r,) for r in regions]),
+    "get_region_comparison (all regions)": (
+        "get_region_comparison", lambda regions: [([r for r in regions if r != "All"],)]
+    ),
+    "get_roi_curve": ("get_roi_curve", lambda regions: [()]),
+    "get_roi_scenario": ("get_roi_scenario", lambda regions: [(t,) for t in _TARGETS]),
+    "get_roi_scenarios (5k targets)": ("get_roi_scenarios", lambda regions: [(np.linspace(4.0, 8.0, 5000),)]),
+    "get_roi_scenarios (5k, by date)": (
+        "get_roi_scenarios", lambda regions: [(np.linspace(4.0, 8.0, 5000), "2026-03")]
+    ),
+}
+
+
+def bench_case(data, regions: list[str], name: str, repeat: int) -> dict:
+    """One public function cold (caches and stores dropped before each call), then warm over the same calls."""
+    fn_name, build = CASES[name]
+    fn, args = getattr(data, fn_name), build(regions)
+    calls = (args * repeat)[: max(repeat, len(args))]
+
+    def cold(*a):
+        data.invalidate_cache(full=True)
+        return fn(*a)
+
+    results = {f"{name} (cold)": _timed(cold, calls, data)}
+    for a in args:  # warm every argument (each region, each target), not just the first
+        fn(*a)
+    results[f"{name} (warm)"] = _timed(fn, calls, data)
+    return results
+
+
+def bench_renders(data, regions: list[str], renders: int) -> dict:
+    """Headless app.py runs (Streamlit AppTest): first render cold, then region switches."""
+    from streamlit.testing.v1 import AppTest
+
+    data.invalidate_cache(full=True)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    q0 = _queries(data)
+    peak0 = _peak_rss_mb()
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    peak = _peak_rss_mb() - peak0
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].value}")
+    results = {"first render (incl. app import)": {
+        "p50_ms": first * 1000, "p95_ms": first * 1000, "queries": _queries(data) - q0, "peak_mb": peak,
+    }}
+    samples = []
+    q0 = _queries(data)
+    for i in range(renders):
+        at.selectbox(key="region").select(regions[i % len(regions)])
+        t0 = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t0)
+    results["region switch"] = {"p50_ms": _pct(samples, 50), "p95_ms": _pct(samples, 95),
+                                "queries": (_queries(data) - q0) / max(1, renders), "peak_mb": float("nan")}
+    return results
+
+
+def run_child(args) -> dict:
+    """One case in this (fresh) process against the parent's snapshots."""
+    # Configure before the data layer is imported: it reads these at import time.
+    os.environ.update({
+        "SNAP_BACKEND": "local",
+        "SNAP_LOCAL_SNAPSHOT_DIR": args.snapshot_dir,
+        "SNAP_REGION_STORE": "true" if args.region_store else "false",
+        # Measure the request path only: no scheduler refreshing behind it, no snapshots from earlier runs.
+        "SNAP_BACKGROUND_REFRESH": "false",
+        "SNAP_WARM_START": "false",
+    })
+    warnings.filterwarnings("ignore")
+    import dashboard_data as data
+
+    regions = data.get_regions()
+    data.invalidate_cache(full=True)
+    if args.case == "app":
+        from streamlit.testing.v1 import AppTest  # noqa: F401  (imported before the baseline)
+
+        return bench_renders(data, regions, args.renders)
+    return bench_case(data, regions, args.case, args.repeat)
+
+
+def _child_cmd(args, case: str) -> list[str]:
+    cmd = [sys.executable, os.path.abspath(__file__), "--case", case, "--snapshot-dir", args.snapshot_dir,
+           "--repeat", str(args.repeat), "--renders", str(args.renders)]
+    return cmd + ([] if args.region_store else ["--no-region-store"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--regions", type=int, default=10)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20, help="calls per data-layer case")
+    parser.add_argument("--renders", type=int, default=20, help="region-switch reruns of the app")
+    parser.add_argument("--region-store", action=argparse.BooleanOptionalAction, default=True,
+                        help="SNAP_REGION_STORE for this run")
+    parser.add_argument("--skip-app", action="store_true", help="data layer only")
+    parser.add_argument("--json", help="also write results to this file (for regression tracking)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # child process: run this case only
+    parser.add_argument("--snapshot-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_child(args)))
+        return
+
+    from dashboard_data_local import synthetic_tables, write_snapshots
+
+    args.snapshot_dir = tempfile.mkdtemp(prefix="snap-bench-")
+    tables = synthetic_tables(args.regions, args.years)
+    write_snapshots(tables, args.snapshot_dir)
+
+    rows = {name: len(df) for name, df in tables.items()}
+    print(f"regions={args.regions} years={args.years} rows={rows} region_store={args.region_store}")
+    case_names = list(CASES)
+    if not args.skip_app:
+        case_names.append("app")
+    results = {}
+    for case in case_names:
+        proc = subprocess.run(_child_cmd(args, case), capture_output=True, text=True, check=True)
+        results.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{'case':42s} {'p50 ms':>9s} {'p95 ms':>9s} {'queries':>8s} {'peak MB':>8s}")
+    for name, r in results.items():
+        print(f"{name:42s} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['queries']:8.2f} {r['peak_mb']:8.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": {**vars(args), "rows": rows}, "results": results}, f, indent=2)
+    shutil.rmtree(args.snapshot_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: pd.read_sql row materialization vs Arrow fetch (dashboard_fetch.fetch_frame).
+Uses a local stand-in cursor serving a synthetic weekly latency result set; no Databricks needed.
+
+    python benchmarks/bench_fetch.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard_fetch import fetch_frame  # noqa: E402
+
+
+def synthetic_table(rows: int) -> pa.Table:
+    """week_start (tz-aware timestamp), region, median/p90 latency (decimal(10,2)) like the gold table."""
+    rng = np.random.default_rng(0)
+    weeks = pd.date_range("2015-01-05", periods=rows, freq="h", tz="UTC")
+    regions = np.array(["Region A", "Region B", "Region C", "Region D"])[rng.integers(0, 4, rows)]
+    median = np.round(rng.uniform(4, 20, rows), 2)
+    p90 = np.round(median * 2, 2)
+    dec = pa.decimal128(10, 2)
+    return pa.table({
+        "month_start": pa.array(weeks),
+        "region": pa.array(regions),
+        "median_latency_days": pa.array(median).cast(dec),
+        "p90_latency_days": pa.array(p90).cast(dec),
+    })
+
+
+class StandInCursor:
+    """DBAPI-ish cursor over a prebuilt Arrow table; fetchall() yields Python row tuples like the connector."""
+
+    def __init__(self, table: pa.Table):
+        self._table = table
+        self.description = None
+
+    def execute(self, query, params=None):
+        self.description = [(name, None, None, None, None, None, None) for name in self._table.column_names]
+
+    def fetchall(self):
+        cols = [c.to_pylist() for c in self._table.columns]
+        return list(zip(*cols))
+
+    def fetchall_arrow(self):
+        return self._table
+
+    def close(self):
+        pass
+
+
+class StandInConnection:
+    def __init__(self, table: pa.Table):
+        self._table = table
+
+    def cursor(self):
+        return StandInCursor(self._table)
+
+    def close(self):
+        pass
+
+
+def _read_sql(table):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # pandas warns on non-SQLAlchemy DBAPI connections
+        return pd.read_sql("SELECT * FROM latency", StandInConnection(table))
+
+
+def _arrow(table):
+    cursor = StandInCursor(table)
+    cursor.execute("SELECT * FROM latency")
+    return fetch_frame(cursor)
+
+
+def _measure(fn, table, repeat: int) -> tuple[float, float, float, pd.DataFrame]:
+    """Best wall time, peak Python-heap MB (tracemalloc) and Arrow-pool MB held by the result."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = fn(table)
+        best = min(best, time.perf_counter() - t0)
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    df = fn(table)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6, (pa.total_allocated_bytes() - arrow_before) / 1e6, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    table = synthetic_table(args.rows)
+    print(f"rows={args.rows:,}")
+    for name, fn in [("pd.read_sql", _read_sql), ("arrow fetch", _arrow)]:
+        secs, heap_mb, arrow_mb, df = _measure(fn, table, args.repeat)
+        dtypes = ", ".join(f"{c}:{t}" for c, t in df.dtypes.items())
+        print(f"{name:12s} best {secs * 1000:8.1f} ms  py-heap peak {heap_mb:7.1f} MB  arrow {arrow_mb:7.1f} MB  [{dtypes}]")
+        del df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: cold start of the app process.
+Each run is a fresh interpreter: the slowest imports of the app's modules (python -X importtime), then a
+headless first render of app.py (Streamlit AppTest) with its dashboard_startup phase report. Uses the mock
+backend unless SNAP_BACKEND is set; no Databricks needed.
+
+    python benchmarks/bench_startup.py --runs 3 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_FIRST_RENDER = """
+import json, time, warnings
+warnings.filterwarnings("ignore")
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+import dashboard_startup
+print(json.dumps({
+    "wall_ms": round((time.perf_counter() - t0) * 1000, 1),
+    "errors": [str(e.value) for e in at.exception],
+    "report": dashboard_startup.startup_report(),
+}))
+"""
+
+
+def import_times(modules: list[str], top: int) -> list[tuple[str, float, float]]:
+    """(module, self ms, cumulative ms) of the `top` slowest imports in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return sorted(rows, key=lambda r: r[2], reverse=True)[:top]
+
+
+def first_render() -> dict:
+    proc = subprocess.run([sys.executable, "-c", _FIRST_RENDER], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="fresh-process first renders")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    print("slowest imports (dashboard_data, dashboard_charts)")
+    print(f"{'module':<48}{'self ms':>10}{'cum ms':>10}")
+    for name, self_ms, cumulative_ms in import_times(["dashboard_data", "dashboard_charts"], args.top):
+        print(f"{name:<48}{self_ms:>10.1f}{cumulative_ms:>10.1f}")
+
+    for run in range(args.runs):
+        result = first_render()
+        if result["errors"]:
+            raise RuntimeError(f"app raised: {result['errors'][0]}")
+        print(f"\nrun {run + 1}: first render {result['wall_ms']:.0f} ms (incl. AppTest import)")
+        for phase in result["report"]["phases"]:
+            print(f"  {phase['name']:<32}{phase['start_ms']:>10.1f} ms +{phase['duration_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
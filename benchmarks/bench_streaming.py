@@ -0,0 +1,120 @@
+"""
+Benchmark: peak memory of the statewide latency fetch, whole result vs streamed and folded per batch.
+Whole is fetch_frame + aggregate_latency_all; streamed is iter_batches + MeanFold (dashboard_fetch).
+Each mode runs in a fresh process against a stand-in cursor that generates the weekly latency result for
+`--regions` regions over `--years` years batch by batch, so the source itself holds no memory. Reports the
+peak RSS above the post-import baseline; no Databricks needed.
+
+    python benchmarks/bench_streaming.py --regions 200 --years 20
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = {
+    "whole + aggregate (All)": "whole",
+    "streamed, folded statewide (All)": "statewide",
+}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class StandInCursor:
+    """Connector-like cursor producing (week_start, region, decimal latencies) rows ordered by week on demand."""
+
+    def __init__(self, regions: int, years: int):
+        import pandas as pd
+
+        self._weeks = pd.date_range("2000-01-03", periods=years * 52, freq="W-MON", tz="UTC")
+        self._regions = [f"Region {i:03d}" for i in range(regions)]
+        self._rows = len(self._weeks) * regions
+        self._offset = 0
+        self.description = [(c, None, None, None, None, None, None) for c in
+                            ("month_start", "region", "median_latency_days", "p90_latency_days")]
+
+    def execute(self, query, params=None):
+        self._offset = 0
+
+    def _table(self, start: int, stop: int):
+        import numpy as np
+        import pyarrow as pa
+
+        idx = np.arange(start, stop)
+        rng = np.random.default_rng(start)
+        median = np.round(rng.uniform(3, 20, len(idx)), 2)
+        dec = pa.decimal128(10, 2)
+        return pa.table({
+            "month_start": pa.array(self._weeks[idx // len(self._regions)]),
+            "region": pa.array(np.asarray(self._regions)[idx % len(self._regions)]),
+            "median_latency_days": pa.array(median).cast(dec),
+            "p90_latency_days": pa.array(np.round(median * 2, 2)).cast(dec),
+        })
+
+    def fetchall_arrow(self):
+        return self.fetchmany_arrow(self._rows)
+
+    def fetchmany_arrow(self, size):
+        start, self._offset = self._offset, min(self._offset + size, self._rows)
+        return self._table(start, self._offset)
+
+    def close(self):
+        pass
+
+
+def run_mode(mode: str, regions: int, years: int, batch_rows: int) -> dict:
+    import dashboard_data_real as real
+    from dashboard_fetch import fetch_frame, iter_batches
+    from dashboard_store import aggregate_latency_all
+
+    cursor = StandInCursor(regions, years)
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    cursor.execute("latency_timeseries")
+    if mode == "whole":
+        df = aggregate_latency_all(fetch_frame(cursor))
+    else:
+        df = real._fold_latency_statewide(iter_batches(cursor, batch_rows))
+    return {
+        "rows_in": cursor._rows,
+        "rows_out": len(df),
+        "ms": (time.perf_counter() - start) * 1000,
+        "peak_mb": _peak_rss_mb() - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--regions", type=int, default=200)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--batch-rows", type=int, default=50_000)
+    parser.add_argument("--mode", choices=sorted(set(MODES.values())), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:  # child process
+        print(json.dumps(run_mode(args.mode, args.regions, args.years, args.batch_rows)))
+        return
+
+    print(f"{'mode':<38}{'rows in':>12}{'rows out':>10}{'ms':>10}{'peak MB':>10}")
+    for label, mode in MODES.items():
+        proc = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--regions", str(args.regions), "--years", str(args.years),
+             "--batch-rows", str(args.batch_rows)],
+            capture_output=True, text=True, check=True,
+        )
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{label:<38}{r['rows_in']:>12,}{r['rows_out']:>10,}{r['ms']:>10.0f}{r['peak_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
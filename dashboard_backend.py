@@ -0,0 +1,65 @@
+"""
+Backend protocol for the data layer and runtime backend selection.
+A backend is any object (in practice a module) with the functions below; dashboard_data wraps whichever
+one is active with caching, the region store and tracing. Backends are imported on first use, so the
+Databricks connector or DuckDB is only needed when that backend is selected.
+"""
+import importlib
+import os
+from typing import Protocol, runtime_checkable
+
+import pandas as pd
+
+# Backend name -> module implementing the protocol.
+BACKENDS = {
+    "mock": "dashboard_data_mock",
+    "databricks": "dashboard_data_real",
+    "local": "dashboard_data_local",
+}
+
+
+@runtime_checkable
+class Backend(Protocol):
+    # Table -> unit of its stored rates, "fraction" or "percent" (dashboard_schema.RATE_SCALES).
+    RATE_UNITS: dict[str, str]
+
+    def get_regions(self) -> list[str]: ...
+
+    def get_per_timeseries(self, region: str | None = None) -> pd.DataFrame: ...
+
+    def get_income_latency_timeseries(self, region: str | None = None) -> pd.DataFrame: ...
+
+    def get_per_all_regions(self, since=None, region: str | None = None) -> pd.DataFrame: ...
+
+    def get_latency_all_regions(self, since=None, region: str | None = None) -> pd.DataFrame: ...
+
+    def get_roi_curve(self) -> pd.DataFrame: ...
+
+    def get_roi_history(self) -> pd.DataFrame: ...
+
+    def get_roi_scenario(self, target_per: float) -> dict: ...
+
+    def get_kpi_summary(self, region: str | None = None) -> dict: ...
+
+    def get_pool_stats(self) -> dict: ...
+
+    def get_query_stats(self) -> dict: ...
+
+    def get_table_versions(self) -> dict[str, int]: ...
+
+
+def default_backend_name() -> str:
+    """SNAP_BACKEND if set, else the legacy USE_MOCK_BACKEND flag (mock unless it is "false")."""
+    name = os.getenv("SNAP_BACKEND")
+    if name:
+        return name.lower()
+    return "mock" if os.getenv("USE_MOCK_BACKEND", "true").lower() == "true" else "databricks"
+
+
+def load_backend(name: str) -> Backend:
+    if name not in BACKENDS:
+        raise RuntimeError(f"Unknown backend {name!r}; expected one of {', '.join(BACKENDS)}.")
+    module = importlib.import_module(BACKENDS[name])
+    if not isinstance(module, Backend):
+        raise RuntimeError(f"{BACKENDS[name]} does not implement the dashboard_backend.Backend protocol.")
+    return module
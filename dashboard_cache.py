@@ -0,0 +1,60 @@
+"""
+Process-wide TTL + LRU result cache for the dashboard data layer.
+Entries are tagged with the gold tables they were read from so a table change can drop just those entries.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a per-entry TTL. Values are shared across sessions: treat them as read-only."""
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, tables, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+    def get(self, key) -> tuple[bool, object]:
+        """Return (hit, value); expired entries count as misses and are dropped."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            expires_at, _, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, value
+
+    def set(self, key, value, ttl_seconds: float, tables: tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, frozenset(tables), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+
+    def invalidate(self, tables: tuple[str, ...] | None = None) -> int:
+        """Drop entries reading any of `tables` (all entries if None). Returns the number dropped."""
+        with self._lock:
+            if tables is None:
+                dropped = list(self._entries)
+            else:
+                wanted = set(tables)
+                dropped = [k for k, (_, t, _) in self._entries.items() if t & wanted]
+            for key in dropped:
+                del self._entries[key]
+            self._stats["invalidated"] += len(dropped)
+            return len(dropped)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self._max_entries}
@@ -0,0 +1,313 @@
+"""
+Plotly figure builders for the PER and latency charts, over frames normalized by the data layer
+(dashboard_schema: per_rate in percent, naive datetime64 month_start).
+Figures are memoized process-wide on a content hash of the input frame plus the layout constants, so a
+rerun with unchanged data skips building the figure (decimation, traces, layout). st.plotly_chart still
+validates and serializes it on every rerun, even when given a dict spec. Series are emitted as numpy
+arrays (x as epoch-ms on a date axis), which Plotly serializes as compact base64 typed arrays instead of
+per-point JSON values.
+Series longer than the point budget are downsampled (dashboard_lod) inside an optional date window;
+narrowing the window brings back full resolution.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from dashboard_cache import TTLCache
+from dashboard_lod import crossing_indices, decimate, event_indices
+from dashboard_trace import annotate, traced
+
+# Event dates for chart markers
+INGESTION_CHANGE_DATE = "2025-12-03"
+REMEDIATION_DATE = "2026-01-12"
+PER_THRESHOLD = 6.0
+
+# Points per series the browser has to draw; roughly the pixel width of a half-page chart.
+MAX_POINTS = int(os.getenv("SNAP_CHART_MAX_POINTS", "800"))
+
+# Small multiples: panels per row, pixel height per row.
+GRID_COLUMNS = 4
+GRID_ROW_HEIGHT = 180
+
+# plotly_dark trimmed to its layout and scatter defaults; the full template ships defaults for every
+# trace type and would otherwise be embedded in each figure's JSON.
+_DARK = pio.templates["plotly_dark"]
+_COMPACT_DARK = go.layout.Template(layout=_DARK.layout, data={"scatter": _DARK.data.scatter})
+
+# Dark theme: plotly layout
+CHART_LAYOUT = dict(
+    template=_COMPACT_DARK,
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    font=dict(color="#e0e0e0", size=12),
+    margin=dict(l=50, r=30, t=40, b=50),
+    xaxis=dict(showgrid=True, gridcolor="rgba(128,128,128,0.3)", type="date"),
+    yaxis=dict(showgrid=True, gridcolor="rgba(128,128,128,0.3)"),
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    hovermode="x unified",
+)
+
+# Part of every cache key, so editing a layout constant invalidates built figures.
+_LAYOUT_KEY = hashlib.blake2b(
+    repr((sorted((k, v) for k, v in CHART_LAYOUT.items() if k != "template"),
+          INGESTION_CHANGE_DATE, REMEDIATION_DATE, PER_THRESHOLD)).encode(),
+    digest_size=8,
+).hexdigest()
+
+_figures = TTLCache(max_entries=64)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame (values and column names, not index)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _memoized(kind: str, df: pd.DataFrame, build, *params):
+    key = (kind, _LAYOUT_KEY, frame_fingerprint(df), params)
+    hit, value = _figures.get(key)
+    annotate(cache="hit" if hit else "miss", rows=len(df))
+    if hit:
+        return value
+    value = build(df, *params)
+    _figures.set(key, value, float("inf"))
+    return value
+
+
+def _epoch_ms(s: pd.Series) -> np.ndarray:
+    """Timestamps as float64 ms since epoch: a typed array Plotly renders on a date axis."""
+    return s.to_numpy(dtype="datetime64[ms]").astype("int64").astype("float64")
+
+
+def _event_ms() -> list[float]:
+    return [float(pd.Timestamp(d).value // 1_000_000) for d in (INGESTION_CHANGE_DATE, REMEDIATION_DATE)]
+
+
+def _window(months: pd.Series, x_range) -> np.ndarray:
+    """Boolean mask of rows inside x_range=(start, end); everything when x_range is None."""
+    if x_range is None:
+        return np.ones(len(months), dtype=bool)
+    start, end = (pd.Timestamp(v) for v in x_range)
+    return ((months >= start) & (months <= end)).to_numpy()
+
+
+def needs_window(df: pd.DataFrame, max_points: int = MAX_POINTS) -> bool:
+    """True when a series is long enough to be downsampled, i.e. a date window would add detail."""
+    return len(df) > max_points
+
+
+def _build_per(per_df: pd.DataFrame, max_points: int, x_range) -> go.Figure:
+    shown = per_df[_window(per_df["month_start"], x_range)]
+    x_vals = _epoch_ms(shown["month_start"])
+    y_vals = shown["per_rate"].to_numpy(dtype="float32")
+    idx = decimate(
+        x_vals, [y_vals], max_points,
+        keep=event_indices(x_vals, _event_ms()),
+        soft_keep=crossing_indices(y_vals, PER_THRESHOLD),
+    )
+    fig_per = go.Figure()
+    fig_per.add_trace(
+        go.Scatter(
+            x=x_vals[idx],
+            y=y_vals[idx],
+            mode="lines",
+            name="PER %",
+            line=dict(color="#3b82f6", width=2),
+        )
+    )
+    fig_per.add_hline(
+        y=PER_THRESHOLD,
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Above Threshold",
+        annotation_position="top right",
+    )
+    fig_per.update_layout(**CHART_LAYOUT)
+    fig_per.update_yaxes(title="%", range=[0, None])
+    fig_per.update_xaxes(title="")
+    return fig_per
+
+
+def _build_latency(lat_df: pd.DataFrame, max_points: int, x_range) -> go.Figure:
+    months = lat_df["month_start"]
+    mask = _window(months, x_range)
+    months = months[mask]
+    x_vals = _epoch_ms(months)
+    x_min, x_max = months.min(), months.max()
+    median = lat_df["median_latency_days"].to_numpy(dtype="float32")[mask]
+    p90 = lat_df["p90_latency_days"].to_numpy(dtype="float32")[mask]
+    idx = decimate(x_vals, [median, p90], max_points, keep=event_indices(x_vals, _event_ms()))
+    y_max_lat = float(max(median.max(), p90.max())) if len(months) else 0.0
+    x_vals, median, p90 = x_vals[idx], median[idx], p90[idx]
+    fig_lat = go.Figure()
+    fig_lat.add_trace(
+        go.Scatter(
+            x=x_vals,
+            y=median,
+            mode="lines",
+            name="Median",
+            line=dict(color="#3b82f6", width=2),
+        )
+    )
+    fig_lat.add_trace(
+        go.Scatter(
+            x=x_vals,
+            y=p90,
+            mode="lines",
+            name="P90",
+            line=dict(color="#a855f7", width=2, dash="dash"),
+        )
+    )
+    # Vertical lines: ingestion change & remediation (add_shape to avoid add_vline mean/sum on mixed types)
+    for label, date_str in [
+        ("Ingestion change", INGESTION_CHANGE_DATE),
+        ("Remediation", REMEDIATION_DATE),
+    ]:
+        d = pd.Timestamp(date_str)
+        if x_min <= d <= x_max:
+            d_ms = float(d.value // 1_000_000)
+            fig_lat.add_shape(
+                type="line",
+                x0=d_ms, x1=d_ms,
+                y0=0, y1=y_max_lat,
+                xref="x", yref="y",
+                line=dict(color="orange", dash="dot", width=1.5),
+            )
+            fig_lat.add_annotation(
+                x=d_ms, y=y_max_lat, yref="y", xref="x",
+                text=label, showarrow=False,
+                yanchor="bottom", font=dict(size=10, color="orange"),
+            )
+    fig_lat.update_layout(**CHART_LAYOUT)
+    fig_lat.update_yaxes(title="Days", range=[0, None])
+    fig_lat.update_xaxes(title="")
+    return fig_lat
+
+
+def _build_scenario(curve_df: pd.DataFrame, target_per: float) -> go.Figure:
+    rates = curve_df["target_per"].to_numpy(dtype="float32")
+    exposure = curve_df["projected_penalty_exposure_usd"].to_numpy(dtype="float32")
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=rates,
+            y=exposure,
+            mode="lines",
+            name="Projected exposure",
+            line=dict(color="#3b82f6", width=2),
+        )
+    )
+    # Highlight the slider point, interpolated on the same curve
+    fig.add_trace(
+        go.Scatter(
+            x=[target_per],
+            y=[float(np.interp(target_per, rates, exposure))] if len(rates) else [],
+            mode="markers",
+            name=f"Target {target_per:.1f}%",
+            marker=dict(color="#f59e0b", size=12, line=dict(color="#fafafa", width=1)),
+        )
+    )
+    fig.add_vline(x=PER_THRESHOLD, line_dash="dash", line_color="red")
+    fig.update_layout(**CHART_LAYOUT)
+    fig.update_xaxes(title="Target PER %", type="linear")
+    fig.update_yaxes(title="Penalty exposure ($)", range=[0, None])
+    return fig
+
+
+@traced("chart.scenario")
+def scenario_chart(curve_df: pd.DataFrame, target_per: float) -> go.Figure:
+    """Projected penalty exposure over a get_roi_scenarios frame, with the slider's target highlighted."""
+    return _memoized("scenario", curve_df, _build_scenario, target_per)
+
+
+def _grid_layout(titles: list[str], height_per_row: int) -> dict:
+    """Layout axes for a row-major grid of panels sharing x and y, with one title annotation per panel."""
+    n = len(titles)
+    cols = max(1, min(GRID_COLUMNS, n))
+    rows = max(1, -(-n // cols))
+    h_gap, v_gap = 0.03, min(0.08, 0.3 / rows)
+    width = (1 - h_gap * (cols - 1)) / cols
+    height = (1 - v_gap * (rows - 1)) / rows
+    grid = dict(showgrid=True, gridcolor="rgba(128,128,128,0.3)")
+    layout = {"annotations": [], "height": height_per_row * rows + 60}
+    for i, title in enumerate(titles):
+        row, col = divmod(i, cols)
+        x0 = col * (width + h_gap)
+        top = 1 - row * (height + v_gap)
+        n_ax = "" if i == 0 else str(i + 1)
+        layout[f"xaxis{n_ax}"] = dict(
+            grid, domain=[x0, x0 + width], anchor=f"y{n_ax}", type="date", matches=None if i == 0 else "x",
+            showticklabels=i + cols >= n,  # labels only on the bottom panel of each column
+        )
+        layout[f"yaxis{n_ax}"] = dict(
+            grid, domain=[top - height, top], anchor=f"x{n_ax}", rangemode="tozero",
+            matches=None if i == 0 else "y", showticklabels=col == 0,
+        )
+        layout["annotations"].append(dict(
+            text=title, x=x0 + width / 2, y=top, xref="paper", yref="paper", xanchor="center", yanchor="bottom",
+            showarrow=False, font=dict(size=11),
+        ))
+    return layout
+
+
+def _build_small_multiples(df: pd.DataFrame, column: str, title: str, threshold, max_points: int) -> go.Figure:
+    regions = [str(r) for r in df["region"].unique()]
+    # One point budget per panel: the grid is as wide as a full-resolution chart.
+    budget = max(50, max_points // GRID_COLUMNS)
+    region_codes = df["region"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, region_codes[1:] != region_codes[:-1]])
+    ends = np.r_[starts[1:], len(df)]
+    x_all = _epoch_ms(df["month_start"])
+    y_all = df[column].to_numpy(dtype="float32")
+    # The figure is assembled as plain dicts and validated once: make_subplots/add_trace(row=, col=) and
+    # add_hline re-validate the whole figure per call, which dominates build time at dozens of panels.
+    traces, shapes = [], []
+    for i, (lo, hi) in enumerate(zip(starts, ends)):
+        x_vals, y_vals = x_all[lo:hi], y_all[lo:hi]
+        keep = crossing_indices(y_vals, threshold) if threshold is not None else None
+        idx = decimate(x_vals, [y_vals], budget, soft_keep=keep)
+        n_ax = "" if i == 0 else str(i + 1)
+        traces.append(dict(
+            type="scatter", x=x_vals[idx], y=y_vals[idx], mode="lines", name=regions[i], showlegend=False,
+            line=dict(color="#3b82f6", width=1.5), xaxis=f"x{n_ax}", yaxis=f"y{n_ax}",
+        ))
+        if threshold is not None:
+            shapes.append(dict(
+                type="line", xref=f"x{n_ax} domain", x0=0, x1=1, yref=f"y{n_ax}", y0=threshold, y1=threshold,
+                line=dict(color="red", dash="dash", width=1),
+            ))
+    layout = {**CHART_LAYOUT, **_grid_layout(regions, GRID_ROW_HEIGHT)}
+    layout.update(title=title, hovermode="closest", shapes=shapes, margin=dict(l=50, r=30, t=60, b=40))
+    return go.Figure(data=traces, layout=layout)
+
+
+@traced("chart.small_multiples")
+def small_multiples(df: pd.DataFrame, column: str, title: str, threshold: float | None = None,
+                    max_points: int = MAX_POINTS) -> go.Figure:
+    """
+    One panel per region (shared axes, GRID_COLUMNS per row) of `column` over a multi-region frame ordered
+    by (region, month_start), e.g. dashboard_data.get_region_comparison()["per"].
+    """
+    return _memoized("small_multiples", df, _build_small_multiples, column, title, threshold, max_points)
+
+
+@traced("chart.per")
+def per_chart(per_df: pd.DataFrame, max_points: int = MAX_POINTS, x_range=None) -> go.Figure:
+    """PER trend figure with the federal threshold line within x_range, downsampled to max_points."""
+    return _memoized("per", per_df, _build_per, max_points, x_range)
+
+
+@traced("chart.latency")
+def latency_chart(lat_df: pd.DataFrame, max_points: int = MAX_POINTS, x_range=None) -> go.Figure:
+    """Median/P90 latency figure with ingestion-change and remediation markers, downsampled to max_points."""
+    return _memoized("latency", lat_df, _build_latency, max_points, x_range)
+
+
+def get_figure_cache_stats() -> dict:
+    return _figures.stats()
@@ -1,33 +1,465 @@
 """
 Data layer for Executive Fiscal ROI Dashboard.
-Uses gold_snap_per_timeseries, gold_snap_roi_scenarios, gold_income_latency_timeseries.
+Uses gold_snap_per_timeseries, gold_snap_roi_scenarios, gold_income_latency_timeseries through a
+pluggable backend (mock, Databricks SQL warehouse, or local DuckDB over Parquet snapshots).
+Fetched frames are normalized once (dashboard_schema: typed columns, rates in percent) before caching.
+Query results are cached process-wide (TTL + LRU) and dropped when a gold table's Delta version changes.
+With SNAP_REGION_STORE (default on) the PER and latency tables are held in memory for all regions and
+every region, including "All", is served as a local slice. With SNAP_WARM_START (default on) fetched
+tables are persisted to disk, and a restarted process serves them at once while refreshing behind them.
+With SNAP_BACKGROUND_REFRESH (default on) a scheduler thread refreshes the tables and polls Delta versions,
+so renders read already-loaded data and never wait on a refresh.
 """
+import functools
 import os
+import threading
+import time
 from datetime import datetime
 
-USE_MOCK = os.getenv("USE_MOCK_BACKEND", "true").lower() == "true"
+from dashboard_startup import phase as startup_phase, startup_report
+from dashboard_backend import BACKENDS, default_backend_name, load_backend
+from dashboard_cache import TTLCache
+from dashboard_exec import PANEL_TIMEOUT_SECONDS, panel_deadline, panel_result, submit
+from dashboard_kpi import kpi_frame, kpi_from_frames
+from dashboard_roi import (
+    build_curve, curves_by_month, interpolate, scenario_frame, scenario_frame_by, scenario_from_curve,
+)
+from dashboard_scheduler import RefreshScheduler
+from dashboard_schema import LATENCY_TABLE, PER_TABLE, ROI_TABLE, normalize, normalize_kpi
+from dashboard_snapshot import TableSnapshot
+from dashboard_store import RegionStore, aggregate_latency_all, aggregate_per_all
+from dashboard_trace import annotate, enabled as trace_enabled, recent_renders, render_trace, span, traced
 
-if USE_MOCK:
-    from dashboard_data_mock import (
-        get_per_timeseries,
-        get_income_latency_timeseries,
-        get_roi_scenario,
-        get_kpi_summary,
-        get_regions,
-    )
+USE_REGION_STORE = os.getenv("SNAP_REGION_STORE", "true").lower() == "true"
+USE_WARM_START = os.getenv("SNAP_WARM_START", "true").lower() == "true"
+USE_BACKGROUND_REFRESH = os.getenv("SNAP_BACKGROUND_REFRESH", "true").lower() == "true"
+
+# Active backend (dashboard_backend.BACKENDS): SNAP_BACKEND, else mock/databricks from USE_MOCK_BACKEND.
+# Imported on first use and switchable at runtime with set_backend().
+_backend_name = default_backend_name()
+_backend = None
+_backend_lock = threading.Lock()
+
+_CATALOG = os.getenv("SNAP_CATALOG", "ashraf")
+_SCHEMA = os.getenv("SNAP_SCHEMA", "ashraf_osman_snap2")
+
+# TTL per table: SNAP_CACHE_TTL_SECONDS, overridden by e.g. SNAP_CACHE_TTL_GOLD_SNAP_PER_TIMESERIES.
+_DEFAULT_TTL_SECONDS = float(os.getenv("SNAP_CACHE_TTL_SECONDS", "900"))
+_VERSION_CHECK_SECONDS = float(os.getenv("SNAP_VERSION_CHECK_SECONDS", "60"))
+_REFRESH_LOOKBACK_DAYS = float(os.getenv("SNAP_REFRESH_LOOKBACK_DAYS", "35"))
+_REFRESH_RETRY_SECONDS = float(os.getenv("SNAP_REFRESH_RETRY_SECONDS", "30"))
+# Scheduled refreshes run at this fraction of a table's TTL, so cached entries are replaced before they expire.
+_REFRESH_AHEAD = 0.8
+
+_cache = TTLCache(max_entries=int(os.getenv("SNAP_CACHE_MAX_ENTRIES", "256")))
+_versions: dict[str, int] = {}
+_versions_checked_at = float("-inf")
+_versions_lock = threading.Lock()
+
+
+def backend_name() -> str:
+    return _backend_name
+
+
+def _active_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                # First use imports the backend module (and its driver); timed in the startup report.
+                with span("data.load_backend", backend=_backend_name), startup_phase(f"backend.{_backend_name}"):
+                    _backend = load_backend(_backend_name)
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """Switch the whole process to another backend; cached results, stores and seen versions are dropped."""
+    global _backend, _backend_name
+    backend = load_backend(name)
+    with _backend_lock:
+        _backend, _backend_name = backend, name
+    _versions.clear()
+    invalidate_cache(full=True)
+
+
+# Loaders resolve the backend on every call, so a set_backend() takes effect on the next cache miss.
+# Frames are normalized here (dashboard_schema), once per fetch; caches and stores hold the typed frames.
+def _normalize(table: str, df, backend):
+    with span("data.normalize", table=table, rows=len(df)):
+        return normalize(table, df, backend.RATE_UNITS.get(table))
+
+
+def _get_regions() -> list[str]:
+    return _active_backend().get_regions()
+
+
+def _get_per_timeseries(region: str | None = None):
+    backend = _active_backend()
+    return _normalize(PER_TABLE, backend.get_per_timeseries(region), backend)
+
+
+def _get_income_latency_timeseries(region: str | None = None):
+    backend = _active_backend()
+    return _normalize(LATENCY_TABLE, backend.get_income_latency_timeseries(region), backend)
+
+
+def _get_per_all_regions(since=None, region: str | None = None):
+    backend = _active_backend()
+    return _normalize(PER_TABLE, backend.get_per_all_regions(since, region), backend)
+
+
+def _get_latency_all_regions(since=None, region: str | None = None):
+    backend = _active_backend()
+    return _normalize(LATENCY_TABLE, backend.get_latency_all_regions(since, region), backend)
+
+
+def _get_roi_curve():
+    backend = _active_backend()
+    return _normalize(ROI_TABLE, backend.get_roi_curve(), backend)
+
+
+def _get_roi_history():
+    backend = _active_backend()
+    return _normalize(ROI_TABLE, backend.get_roi_history(), backend)
+
+
+def _get_kpi_summary(region: str | None = None) -> dict:
+    backend = _active_backend()
+    return normalize_kpi(backend.get_kpi_summary(region), backend.RATE_UNITS[PER_TABLE])
+
+
+def get_pool_stats() -> dict:
+    return _active_backend().get_pool_stats()
+
+
+def get_query_stats() -> dict:
+    return _active_backend().get_query_stats()
+
+
+def get_table_versions() -> dict[str, int]:
+    return _active_backend().get_table_versions()
+
+
+def table_ttl(table: str) -> float:
+    return float(os.getenv(f"SNAP_CACHE_TTL_{table.upper()}", _DEFAULT_TTL_SECONDS))
+
+
+def _snapshot(table: str, required: tuple[str, ...]) -> TableSnapshot | None:
+    """Warm-start snapshot of a table, scoped to the active backend and catalog.schema."""
+    if not USE_WARM_START:
+        return None
+    return TableSnapshot(table, lambda: f"{_backend_name}/{_CATALOG}.{_SCHEMA}", required)
+
+
+def invalidate_cache(tables: tuple[str, ...] | None = None, full: bool = False) -> int:
+    """
+    Drop cached results (and region-store tables) that read any of `tables` (everything if None).
+    Stores refresh incrementally on next read, or reload from scratch when full=True.
+    """
+    for table, store in _stores.items():
+        if tables is None or table in tables:
+            store.invalidate(full=full)
+    return _cache.invalidate(tables)
+
+
+def refresh_tables(tables: tuple[str, ...] | None = None, full: bool = False) -> None:
+    """Refresh region-store tables now: incrementally from their watermarks, or fully when full=True."""
+    for table, store in _stores.items():
+        if tables is None or table in tables:
+            store.refresh(full=full)
+
+
+def get_cache_stats() -> dict:
+    return {**_cache.stats(), "stores": {t: s.stats() for t, s in _stores.items()}}
+
+
+def _poll_table_versions(force: bool) -> list[str]:
+    """Compare gold table Delta versions with the last seen ones; returns the tables that changed."""
+    global _versions_checked_at
+    if not force and time.monotonic() - _versions_checked_at < _VERSION_CHECK_SECONDS:
+        return []
+    # Another session already checking: serve from cache rather than queue behind it.
+    if not _versions_lock.acquire(blocking=force):
+        return []
+    try:
+        if not force and time.monotonic() - _versions_checked_at < _VERSION_CHECK_SECONDS:
+            return []
+        current = get_table_versions()
+        changed = [t for t, v in current.items() if t in _versions and _versions[t] != v]
+        _versions.update(current)
+        _versions_checked_at = time.monotonic()
+    finally:
+        _versions_lock.release()
+    return changed
+
+
+def check_table_versions(force: bool = False) -> list[str]:
+    """
+    Compare gold table Delta versions with the last seen ones and invalidate tables that changed.
+    Runs at most once per SNAP_VERSION_CHECK_SECONDS unless forced; returns the changed tables.
+    """
+    changed = _poll_table_versions(force)
+    if changed:
+        invalidate_cache(tuple(changed))
+    return changed
+
+
+def _check_versions_quietly() -> None:
+    if _scheduler.running():
+        return  # the scheduler polls versions; renders never pay for the probe
+    try:
+        check_table_versions()
+    except Exception:
+        pass  # a failed version probe must not break the page; TTL still bounds staleness
+
+
+def _cached(tables: tuple[str, ...]):
+    """Cache a query function on (function, backend, catalog, schema, args) with the shortest TTL of its tables."""
+
+    def decorator(fn):
+        name = fn.__name__
+
+        def key_for(args, kwargs):
+            return (name, _backend_name, _CATALOG, _SCHEMA, args, tuple(sorted(kwargs.items())))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _check_versions_quietly()
+            key = key_for(args, kwargs)
+            hit, value = _cache.get(key)
+            annotate(cache="hit" if hit else "miss")
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            _cache.set(key, value, min(table_ttl(t) for t in tables), tables)
+            return value
+
+        def refresh(*args, **kwargs):
+            # Recompute and overwrite the entry in place, so readers never see a miss in between.
+            value = fn(*args, **kwargs)
+            _cache.set(key_for(args, kwargs), value, min(table_ttl(t) for t in tables), tables)
+            return value
+
+        wrapper.refresh = refresh
+        return wrapper
+
+    return decorator
+
+
+if USE_REGION_STORE:
+    _stores = {
+        PER_TABLE: RegionStore(
+            _get_per_all_regions, aggregate_per_all, lambda: table_ttl(PER_TABLE), _REFRESH_LOOKBACK_DAYS,
+            _snapshot(PER_TABLE, ("month_start", "region", "per_rate", "overpayment_usd", "issued_benefits_usd")),
+            background=USE_BACKGROUND_REFRESH,
+        ),
+        LATENCY_TABLE: RegionStore(
+            _get_latency_all_regions, aggregate_latency_all, lambda: table_ttl(LATENCY_TABLE), _REFRESH_LOOKBACK_DAYS,
+            _snapshot(LATENCY_TABLE, ("month_start", "region", "median_latency_days", "p90_latency_days")),
+            background=USE_BACKGROUND_REFRESH,
+        ),
+    }
+
+    @traced("data.get_regions")
+    def get_regions() -> list[str]:
+        _check_versions_quietly()
+        return ["All"] + _stores[PER_TABLE].regions()
+
+    @traced("data.get_per_timeseries")
+    def get_per_timeseries(region: str | None = None):
+        _check_versions_quietly()
+        return _stores[PER_TABLE].frame(region)
+
+    @traced("data.get_income_latency_timeseries")
+    def get_income_latency_timeseries(region: str | None = None):
+        _check_versions_quietly()
+        return _stores[LATENCY_TABLE].frame(region)
+
+    @traced("data.get_kpi_summary")
+    def get_kpi_summary(region: str | None = None) -> dict:
+        return kpi_from_frames(get_per_timeseries(region), get_income_latency_timeseries(region))
+
+    def _region_frames(regions: list[str]) -> tuple:
+        _check_versions_quietly()
+        return _stores[PER_TABLE].frames(regions), _stores[LATENCY_TABLE].frames(regions)
 else:
-    from dashboard_data_real import (
-        get_per_timeseries,
-        get_income_latency_timeseries,
-        get_roi_scenario,
-        get_kpi_summary,
-        get_regions,
+    _stores = {}
+    # Without the store, comparisons filter one cached all-regions read per table.
+    _per_all_regions = _cached((PER_TABLE,))(_get_per_all_regions)
+    _latency_all_regions = _cached((LATENCY_TABLE,))(_get_latency_all_regions)
+
+    def _region_frames(regions: list[str]) -> tuple:
+        return tuple(
+            df[df["region"].isin(regions)].sort_values(["region", "month_start"], kind="stable").reset_index(drop=True)
+            for df in (_per_all_regions(), _latency_all_regions())
+        )
+
+    get_regions = traced("data.get_regions")(_cached((PER_TABLE,))(_get_regions))
+    get_per_timeseries = traced("data.get_per_timeseries")(_cached((PER_TABLE,))(_get_per_timeseries))
+    get_income_latency_timeseries = traced("data.get_income_latency_timeseries")(
+        _cached((LATENCY_TABLE,))(_get_income_latency_timeseries)
     )
+    get_kpi_summary = traced("data.get_kpi_summary")(_cached((PER_TABLE, LATENCY_TABLE))(_get_kpi_summary))
+
+
+@traced("data.get_region_comparison")
+def get_region_comparison(regions) -> dict:
+    """
+    Several regions side by side: "per" and "latency" rows for all of them, ordered by (region, month_start),
+    and "kpi", one kpi_from_frames row per region (in the order given) computed with one groupby. Served
+    from the in-memory region store (or one all-regions read per table), never one query per region.
+    """
+    regions = list(regions)
+    per_df, lat_df = _region_frames(regions)
+    kpi = kpi_frame(per_df, lat_df)
+    return {"per": per_df, "latency": lat_df, "kpi": kpi.reindex([r for r in regions if r in kpi.index])}
+
+
+_roi_snapshot = _snapshot(ROI_TABLE, ("month_start", "per_rate_projected", "projected_penalty_exposure_usd"))
+_roi_warm_tried = _roi_snapshot is None
+
+
+def _fetch_roi_curve():
+    df = _get_roi_curve()
+    if _roi_snapshot is not None:
+        _roi_snapshot.save(df)
+    return df
+
+
+def _refresh_roi_curve(served) -> None:
+    # Runs behind a warm start: the cached curve is dropped only if the backend disagrees with the snapshot.
+    if not _fetch_roi_curve().equals(served):
+        _cache.invalidate((ROI_TABLE,))
+
+
+@traced("data.get_roi_curve")
+@_cached((ROI_TABLE,))
+def get_roi_curve() -> tuple:
+    """Sorted (rates %, exposures) arrays for the whole scenario curve; refreshed with the rest of the cache."""
+    global _roi_warm_tried
+    if not _roi_warm_tried:
+        _roi_warm_tried = True
+        served = _roi_snapshot.load()
+        if served is not None:
+            submit(_refresh_roi_curve, served)
+            return build_curve(served)
+    return build_curve(_fetch_roi_curve())
+
+
+@traced("data.get_roi_scenario")
+def get_roi_scenario(target_per: float) -> dict:
+    """Answered in-process by interpolating the cached curve, so slider moves never hit the warehouse."""
+    return scenario_from_curve(get_roi_curve(), target_per)
+
+
+@traced("data.get_roi_curves_by_month")
+@_cached((ROI_TABLE,))
+def get_roi_curves_by_month() -> tuple:
+    """(months, curves): the scenario curve of every month_start, for targets with a date."""
+    return curves_by_month(_get_roi_history())
+
+
+@traced("data.get_roi_scenarios")
+def get_roi_scenarios(target_per, by=None, current_exposure=None):
+    """
+    Batch get_roi_scenario: a frame with one row per target (target_per, projected_penalty_exposure_usd,
+    penalty_reduction_usd, below_threshold), computed in one vectorized pass over the cached curve.
+    current_exposure (e.g. one baseline per region) and `by` (a target date, "5.8% by 2026-03", or one per
+    target; answered on the curve of the latest month_start on or before it) are broadcast with target_per.
+    """
+    if by is None:
+        return scenario_frame(get_roi_curve(), target_per, current_exposure)
+    months, curves = get_roi_curves_by_month()
+    return scenario_frame_by(months, curves, target_per, by, current_exposure)
+
+
+_scheduler = RefreshScheduler(retry_seconds=_REFRESH_RETRY_SECONDS)
+
+
+def _refresh_changed_tables() -> None:
+    """Scheduler job: poll Delta versions and swap fresh data in for changed tables (no cold gap)."""
+    changed = _poll_table_versions(force=True)
+    for table in changed:
+        if table in _stores:
+            _stores[table].refresh()
+    if ROI_TABLE in changed:
+        get_roi_curve.refresh()
+        get_roi_curves_by_month.refresh()
+    # Per-region results (SNAP_REGION_STORE=false) have nothing to swap in; drop them.
+    stale = tuple(t for t in changed if t != ROI_TABLE)
+    if stale:
+        _cache.invalidate(stale)
+
+
+def start_background_refresh() -> None:
+    """
+    Start the process-wide refresh scheduler (idempotent): region-store tables and the ROI curve are
+    prefetched now and refreshed ahead of their TTL, and Delta versions are polled every
+    SNAP_VERSION_CHECK_SECONDS. Failed jobs back off from SNAP_REFRESH_RETRY_SECONDS.
+    """
+    if _scheduler.running():
+        return
+    for table, store in _stores.items():
+        _scheduler.add(f"refresh:{table}", store.refresh, lambda t=table: table_ttl(t) * _REFRESH_AHEAD)
+    _scheduler.add(f"refresh:{ROI_TABLE}", get_roi_curve.refresh, lambda: table_ttl(ROI_TABLE) * _REFRESH_AHEAD)
+    _scheduler.add("versions", _refresh_changed_tables, _VERSION_CHECK_SECONDS)
+    _scheduler.start()
+
+
+def get_scheduler_stats() -> dict:
+    """Per scheduler job: runs, consecutive failures, last error and duration, seconds until next run."""
+    return _scheduler.stats()
+
+
+def submit_panels(region: str | None, target_per: float) -> dict:
+    """
+    Submit the independent panel queries to the shared executor and return their futures:
+    regions, per, latency and scenario. Await each with panel_result(); derive KPIs with kpi_from_frames().
+    """
+    return {
+        "regions": submit(get_regions),
+        "per": submit(get_per_timeseries, region),
+        "latency": submit(get_income_latency_timeseries, region),
+        "scenario": submit(get_roi_scenario, target_per),
+    }
+
 
 __all__ = [
     "get_per_timeseries",
     "get_income_latency_timeseries",
     "get_roi_scenario",
+    "get_roi_curve",
+    "get_roi_scenarios",
+    "get_roi_curves_by_month",
+    "interpolate",
     "get_kpi_summary",
     "get_regions",
+    "get_region_comparison",
+    "kpi_from_frames",
+    "submit_panels",
+    "panel_deadline",
+    "panel_result",
+    "submit",
+    "PANEL_TIMEOUT_SECONDS",
+    "get_pool_stats",
+    "get_query_stats",
+    "get_table_versions",
+    "check_table_versions",
+    "invalidate_cache",
+    "refresh_tables",
+    "get_cache_stats",
+    "table_ttl",
+    "backend_name",
+    "start_background_refresh",
+    "get_scheduler_stats",
+    "set_backend",
+    "BACKENDS",
+    "render_trace",
+    "recent_renders",
+    "span",
+    "trace_enabled",
+    "startup_report",
 ]
+
+if USE_BACKGROUND_REFRESH:
+    start_background_refresh()
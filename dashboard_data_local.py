@@ -0,0 +1,214 @@
+"""
+Local data layer: the warehouse query registry (dashboard_data_real.QUERIES) run on embedded DuckDB
+over Parquet snapshots of the gold tables, one <table>.parquet each in SNAP_LOCAL_SNAPSHOT_DIR.
+Same SQL, connection pool, Arrow fetch and metrics as the warehouse backend; for offline demos and
+load testing at realistic scale. Needs `pip install duckdb`.
+
+    python dashboard_data_local.py --synthetic --regions 20 --years 10   # generate snapshots
+    python dashboard_data_local.py --from-warehouse                     # export the gold tables
+"""
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dashboard_data_real import _CATALOG, _SCHEMA, _TABLES, QUERIES, RATE_UNITS, ConnectionPool, SqlBackend
+
+SNAPSHOT_DIR = os.getenv("SNAP_LOCAL_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"))
+
+# Warehouse named parameters (:name) in DuckDB's spelling ($name); "::" casts are left alone.
+_NAMED_PARAM = re.compile(r"(?<!:):([A-Za-z_]\w*)")
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def _snapshot_path(table: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{table}.parquet")
+
+
+def _database():
+    """Process-wide in-memory DuckDB with <catalog>.<schema>.<table> views over the Parquet snapshots."""
+    global _db
+    with _db_lock:
+        if _db is None:
+            import duckdb
+
+            missing = [t for t in _TABLES if not os.path.exists(_snapshot_path(t))]
+            if missing:
+                raise RuntimeError(
+                    f"No Parquet snapshot for {', '.join(missing)} in {SNAPSHOT_DIR}. "
+                    "Run `python dashboard_data_local.py --synthetic` or `--from-warehouse`."
+                )
+            db = duckdb.connect()
+            db.execute(f"ATTACH ':memory:' AS {_CATALOG}")
+            db.execute(f"CREATE SCHEMA {_CATALOG}.{_SCHEMA}")
+            for table in _TABLES:
+                path = _snapshot_path(table).replace("'", "''")
+                db.execute(f"CREATE VIEW {_CATALOG}.{_SCHEMA}.{table} AS SELECT * FROM read_parquet('{path}')")
+            _db = db
+        return _db
+
+
+class _Cursor:
+    """DuckDB cursor with the connector's fetchall_arrow/fetchmany_arrow, so results take the same Arrow paths."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._reader = None
+        self.description = None
+
+    def execute(self, query, params=None):
+        self._cursor.execute(query, params or {})
+        self._reader = None
+        self.description = self._cursor.description
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def fetchall_arrow(self):
+        return self._cursor.to_arrow_table()
+
+    def fetchmany_arrow(self, size):
+        # Next batch of at most `size` rows; an empty table once the result is exhausted, like the connector.
+        if self._reader is None:
+            self._reader = self._cursor.to_arrow_reader(size)
+        try:
+            return pa.Table.from_batches([self._reader.read_next_batch()])
+        except StopIteration:
+            return self._reader.schema.empty_table()
+
+    def close(self):
+        self._cursor.close()
+
+
+class _Connection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return _Cursor(self._conn.cursor())
+
+    def close(self):
+        self._conn.close()
+
+
+def _connect() -> _Connection:
+    return _Connection(_database().cursor())
+
+
+def _local_queries() -> dict[str, str]:
+    # DESCRIBE HISTORY is Delta-only; snapshot versions come from the files instead.
+    return {
+        name: _NAMED_PARAM.sub(r"$\1", query)
+        for name, query in QUERIES.items()
+        if not name.startswith("version:")
+    }
+
+
+class LocalBackend(SqlBackend):
+    def get_table_versions(self) -> dict[str, int]:
+        """Snapshot file mtime (ns) per gold table; rewriting a snapshot invalidates its cached results."""
+        return {
+            table: os.stat(path).st_mtime_ns if os.path.exists(path) else -1
+            for table, path in ((t, _snapshot_path(t)) for t in _TABLES)
+        }
+
+
+def synthetic_tables(regions: int = 10, years: int = 5, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """
+    The three gold tables at weekly grain: one row per region per week (ROI: one curve per month). Rates
+    use the warehouse's units (RATE_UNITS): per_rate as a fraction, per_rate_projected in percent.
+    """
+    rng = np.random.default_rng(seed)
+    weeks = pd.date_range(end=pd.Timestamp.today().normalize(), periods=years * 52, freq="W-MON")
+    names = [f"Region {i:02d}" for i in range(regions)]
+    n = len(weeks) * regions
+    per = pd.DataFrame({
+        "month_start": np.tile(weeks, regions),
+        "region": np.repeat(names, len(weeks)),
+        "per_rate": np.round(rng.uniform(0.04, 0.08, n), 5),
+        "overpayment_usd": np.round(rng.uniform(1e5, 5e6, n), 2),
+        "issued_benefits_usd": np.round(rng.uniform(5e6, 1e8, n), 2),
+    })
+    latency = pd.DataFrame({
+        "week_start": np.tile(weeks, regions),
+        "region": np.repeat(names, len(weeks)),
+        "median_latency_days": np.round(rng.uniform(3, 20, n), 2),
+    })
+    latency["p90_latency_days"] = np.round(latency["median_latency_days"] * rng.uniform(1.5, 2.5, n), 2)
+    months = pd.date_range(end=weeks[-1], periods=12, freq="MS")
+    rates = np.round(np.arange(4.0, 8.01, 0.1), 1)
+    roi = pd.DataFrame({
+        "month_start": np.repeat(months, len(rates)),
+        "per_rate_projected": np.tile(rates, len(months)),
+    })
+    roi["projected_penalty_exposure_usd"] = np.round(np.maximum(0, roi["per_rate_projected"] - 6.0) * 5e6, 2)
+    return {
+        "gold_snap_per_timeseries": per,
+        "gold_income_latency_timeseries": latency,
+        "gold_snap_roi_scenarios": roi,
+    }
+
+
+def write_snapshots(tables: dict[str, pd.DataFrame], directory: str = SNAPSHOT_DIR) -> None:
+    """Write each frame to <directory>/<table>.parquet (via a temp file, so readers never see a partial file)."""
+    os.makedirs(directory, exist_ok=True)
+    for table, df in tables.items():
+        path = os.path.join(directory, f"{table}.parquet")
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+
+def export_from_warehouse(directory: str = SNAPSHOT_DIR) -> dict[str, int]:
+    """Snapshot every gold table from the SQL warehouse; returns rows written per table."""
+    import dashboard_data_real
+
+    tables = {table: dashboard_data_real.run_named(f"table:{table}") for table in _TABLES}
+    write_snapshots(tables, directory)
+    return {table: len(df) for table, df in tables.items()}
+
+
+_backend = LocalBackend(ConnectionPool(_connect), _local_queries())
+
+# Module API (the dashboard_backend.Backend protocol), bound to the local backend.
+run_named = _backend.run_named
+get_pool_stats = _backend.get_pool_stats
+get_query_stats = _backend.get_query_stats
+get_coalescing_stats = _backend.get_coalescing_stats
+get_regions = _backend.get_regions
+get_per_timeseries = _backend.get_per_timeseries
+get_income_latency_timeseries = _backend.get_income_latency_timeseries
+get_per_all_regions = _backend.get_per_all_regions
+get_latency_all_regions = _backend.get_latency_all_regions
+get_roi_curve = _backend.get_roi_curve
+get_roi_history = _backend.get_roi_history
+get_roi_scenario = _backend.get_roi_scenario
+get_kpi_summary = _backend.get_kpi_summary
+get_table_versions = _backend.get_table_versions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write Parquet snapshots for the local backend.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--synthetic", action="store_true", help="generate synthetic gold tables")
+    source.add_argument("--from-warehouse", action="store_true", help="export the gold tables from the SQL warehouse")
+    parser.add_argument("--regions", type=int, default=10)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+    if args.synthetic:
+        frames = synthetic_tables(args.regions, args.years)
+        write_snapshots(frames, args.dir)
+        rows = {table: len(df) for table, df in frames.items()}
+    else:
+        rows = export_from_warehouse(args.dir)
+    print(f"Wrote {rows} to {args.dir}")
@@ -4,10 +4,23 @@ Synthetic time series with 2025-12-03 ingestion change and 2026-01-12 remediatio
 """
 import pandas as pd
 
+from dashboard_kpi import kpi_from_frames
+from dashboard_schema import PER_TABLE, ROI_TABLE
+
 # Event dates for vertical markers
 INGESTION_CHANGE_DATE = "2025-12-03"
 REMEDIATION_DATE = "2026-01-12"
 
+# Mock rates are generated in percent (6.4 = 6.4%).
+RATE_UNITS = {PER_TABLE: "percent", ROI_TABLE: "percent"}
+
+# Stand-in Delta versions; bump one to exercise cache invalidation locally.
+_TABLE_VERSIONS = {
+    "gold_snap_per_timeseries": 0,
+    "gold_income_latency_timeseries": 0,
+    "gold_snap_roi_scenarios": 0,
+}
+
 def _month_range(start: str, end: str) -> list[str]:
     months = pd.date_range(start=start, end=end, freq="MS")
     return [d.strftime("%Y-%m-%d") for d in months]
@@ -69,6 +82,25 @@ def get_income_latency_timeseries(region: str | None = None) -> pd.DataFrame:
     return df
 
 
+def _since(df: pd.DataFrame, since, region: str | None = None) -> pd.DataFrame:
+    if region is not None:
+        df = df[df["region"] == region].reset_index(drop=True)
+    if since is None:
+        return df
+    return df[pd.to_datetime(df["month_start"]) >= pd.Timestamp(since)].reset_index(drop=True)
+
+
+def get_per_all_regions(since=None, region: str | None = None) -> pd.DataFrame:
+    """Every region's PER rows plus statewide "All" rows, like the unfiltered gold table (month_start >= since)."""
+    return _since(pd.concat([get_per_timeseries(r) for r in get_regions()], ignore_index=True), since, region)
+
+
+def get_latency_all_regions(since=None, region: str | None = None) -> pd.DataFrame:
+    """Every region's latency rows plus statewide "All" rows, like the unfiltered gold table (month_start >= since)."""
+    frames = [get_income_latency_timeseries(r) for r in get_regions()]
+    return _since(pd.concat(frames, ignore_index=True), since, region)
+
+
 def get_roi_scenario(target_per: float) -> dict:
     """Projected penalty exposure for a target PER. Returns projected_penalty_exposure_usd, penalty_reduction_usd, below_threshold."""
     # Mock: current penalty exposure ~10.9M; at 5.8% target we get 32K reduction
@@ -83,27 +115,42 @@ def get_roi_scenario(target_per: float) -> dict:
     }
 
 
+def get_roi_curve() -> pd.DataFrame:
+    """Scenario curve sampled from the mock formula at 0.1pp steps. Columns: month_start, per_rate_projected, projected_penalty_exposure_usd."""
+    rates = [round(4.0 + 0.1 * i, 1) for i in range(41)]
+    return pd.DataFrame({
+        "month_start": "2026-02-01",
+        "per_rate_projected": rates,
+        "projected_penalty_exposure_usd": [get_roi_scenario(r)["projected_penalty_exposure_usd"] for r in rates],
+    })
+
+
+def get_roi_history() -> pd.DataFrame:
+    """The mock curve for every month of the series (it does not change over time)."""
+    curve = get_roi_curve()
+    return pd.concat(
+        [curve.assign(month_start=m) for m in _month_range("2024-01-01", "2026-02-01")], ignore_index=True
+    )
+
+
 def get_kpi_summary(region: str | None = None) -> dict:
-    """Current KPIs: current_per, per_delta_pp, benefits_issued_usd, median_latency_days, p90_latency_days, total_overpayment_usd."""
-    per_df = get_per_timeseries(region)
-    lat_df = get_income_latency_timeseries(region)
-    if per_df.empty or lat_df.empty:
-        return {
-            "current_per": 0.0,
-            "per_delta_pp": 0.0,
-            "benefits_issued_usd": 0.0,
-            "median_latency_days": 0,
-            "p90_latency_days": 0,
-            "total_overpayment_usd": 0.0,
-        }
-    latest_per = per_df.iloc[-1]
-    latest_lat = lat_df.iloc[-1]
-    prev_per = per_df.iloc[-2]["per_rate"] if len(per_df) >= 2 else latest_per["per_rate"]
-    return {
-        "current_per": round(float(latest_per["per_rate"]), 1),
-        "per_delta_pp": round(float(latest_per["per_rate"] - prev_per), 2),
-        "benefits_issued_usd": float(latest_per["issued_benefits_usd"]),
-        "median_latency_days": int(latest_lat["median_latency_days"]),
-        "p90_latency_days": int(latest_lat["p90_latency_days"]),
-        "total_overpayment_usd": 10_900_000.0,  # cumulative identified (mock)
-    }
+    """
+    Current KPIs: current_per, per_delta_pp, benefits_issued_usd, median_latency_days, p90_latency_days, total_overpayment_usd.
+    Same semantics as the real backend's aggregate query (period totals), computed from the mock frames.
+    """
+    return kpi_from_frames(get_per_timeseries(region), get_income_latency_timeseries(region))
+
+
+def get_pool_stats() -> dict:
+    """No warehouse connections in mock mode."""
+    return {}
+
+
+def get_query_stats() -> dict:
+    """No warehouse queries in mock mode."""
+    return {}
+
+
+def get_table_versions() -> dict[str, int]:
+    """Stand-in Delta versions (see _TABLE_VERSIONS)."""
+    return dict(_TABLE_VERSIONS)
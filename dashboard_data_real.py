@@ -2,119 +2,620 @@
 Real data layer: queries gold_snap_per_timeseries, gold_snap_roi_scenarios, gold_income_latency_timeseries.
 Default: catalog ashraf, schema ashraf_osman_snap2. Set DATABRICKS_WAREHOUSE_ID in app resources.
 Override with SNAP_CATALOG, SNAP_SCHEMA if needed.
+Connections come from a process-wide pool shared by all Streamlit sessions (SNAP_POOL_* env to tune).
 """
+import hashlib
 import os
+import re
+import textwrap
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import pandas as pd
-from databricks.sdk.core import Config
-from databricks import sql
+
+import dashboard_startup
+from dashboard_fetch import MeanFold, fetch_frame, iter_batches
+from dashboard_kpi import EMPTY_KPI, kpi_from_row
+from dashboard_roi import build_curve, scenario_from_curve
+from dashboard_schema import PER_TABLE, ROI_TABLE, normalize
+from dashboard_singleflight import SingleFlight
+from dashboard_trace import frame_attrs, span
 
 _CATALOG = os.getenv("SNAP_CATALOG", "ashraf")
 _SCHEMA = os.getenv("SNAP_SCHEMA", "ashraf_osman_snap2")
+_TABLES = ("gold_snap_per_timeseries", "gold_income_latency_timeseries", "gold_snap_roi_scenarios")
+# How each table stores its rates: per_rate as a fraction (0.06255 = 6.255%), per_rate_projected in percent
+# (5.8, the slider's scale). Override per table with e.g. SNAP_RATE_UNIT_GOLD_SNAP_ROI_SCENARIOS=fraction.
+_DEFAULT_RATE_UNITS = {PER_TABLE: "fraction", ROI_TABLE: "percent"}
+RATE_UNITS = {table: os.getenv(f"SNAP_RATE_UNIT_{table.upper()}", unit) for table, unit in _DEFAULT_RATE_UNITS.items()}
+
+# Pool tuning. Max age stays below the ~1h OAuth token lifetime so sessions are recycled before expiry.
+_POOL_SIZE = int(os.getenv("SNAP_POOL_SIZE", "4"))
+_POOL_IDLE_SECONDS = float(os.getenv("SNAP_POOL_IDLE_SECONDS", "300"))
+_POOL_MAX_AGE_SECONDS = float(os.getenv("SNAP_POOL_MAX_AGE_SECONDS", "3000"))
+_POOL_CHECK_AFTER_SECONDS = float(os.getenv("SNAP_POOL_CHECK_AFTER_SECONDS", "30"))
+_POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("SNAP_POOL_ACQUIRE_TIMEOUT_SECONDS", "30"))
+
+_IDENTIFIER = re.compile(r"^[A-Za-z0-9_]+$")
+# HTTP statuses of a rejected or expired credential. Matched on the transport status, never the message
+# text, so a SQL error that merely mentions a token or a number like 4031 is not mistaken for one.
+_AUTH_STATUS_CODES = frozenset({401, 403})
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def _workspace_config():
+    """
+    SDK Config (host and credential chain), resolved once per process rather than per connection. Tokens
+    are refreshed by cfg.authenticate itself, so pooled reconnects after an auth error reuse it.
+    """
+    global _config
+    with _config_lock:
+        if _config is None:
+            from databricks.sdk.core import Config
+
+            with span("warehouse.auth"), dashboard_startup.phase("warehouse.auth"):
+                _config = Config()
+        return _config
 
 
 def _get_conn():
-    cfg = Config()
+    # Connector imported on first connect, so the module (registry, pool) loads without it.
     wh_id = os.getenv("DATABRICKS_WAREHOUSE_ID")
     if not wh_id:
         raise RuntimeError("DATABRICKS_WAREHOUSE_ID not set. Add SQL warehouse in app resources.")
-    return sql.connect(
-        server_hostname=cfg.host,
-        http_path=f"/sql/1.0/warehouses/{wh_id}",
-        credentials_provider=lambda: cfg.authenticate,
-    )
+    cfg = _workspace_config()
+    with dashboard_startup.phase("import.databricks_sql"):
+        from databricks import sql
 
+    with span("warehouse.connect"), dashboard_startup.phase("warehouse.first_connect"):
+        return sql.connect(
+            server_hostname=cfg.host,
+            http_path=f"/sql/1.0/warehouses/{wh_id}",
+            credentials_provider=lambda: cfg.authenticate,
+        )
 
-def _run_query(query: str) -> pd.DataFrame:
-    conn = _get_conn()
+
+def _http_status(exc: BaseException) -> int | None:
+    # databricks.sql.exc.RequestError carries the RPC's status in context["http-code"]; requests'
+    # HTTPError (SDK token refresh) on its response.
+    context = getattr(exc, "context", None)
+    status = context.get("http-code") if isinstance(context, dict) else None
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
     try:
-        return pd.read_sql(query, conn)
-    finally:
-        conn.close()
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
 
 
-def get_regions() -> list[str]:
-    q = f"""
-    SELECT DISTINCT COALESCE(region, 'All') AS region
-    FROM {_CATALOG}.{_SCHEMA}.gold_snap_per_timeseries
-    ORDER BY region
-    """
-    df = _run_query(q)
-    return ["All"] + df["region"].astype(str).tolist()
+def _is_auth_error(exc: Exception) -> bool:
+    """401/403 from the warehouse or token endpoint, or the SDK's Unauthenticated, anywhere in the cause chain."""
+    try:
+        from databricks.sdk.errors import Unauthenticated
+    except ImportError:  # local backend, or an SDK without typed errors
+        Unauthenticated = ()
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, Unauthenticated) or _http_status(exc) in _AUTH_STATUS_CODES:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
 
 
-def get_per_timeseries(region: str | None = None) -> pd.DataFrame:
-    where = f" AND region = '{region}'" if region and region != "All" else ""
-    q = f"""
-    SELECT month_start, region, per_rate, overpayment_usd, issued_benefits_usd
-    FROM {_CATALOG}.{_SCHEMA}.gold_snap_per_timeseries
-    WHERE 1=1 {where}
-    ORDER BY month_start
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used", "generation")
+
+    def __init__(self, conn, generation: int):
+        now = time.monotonic()
+        self.conn = conn
+        self.generation = generation
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
     """
-    return _run_query(q)
+    Bounded, thread-safe pool of warehouse connections.
+    Idle connections are evicted after idle_seconds, recycled after max_age_seconds, and
+    health-checked with SELECT 1 when they have sat idle longer than check_after_seconds.
+    """
+
+    def __init__(
+        self,
+        connect,
+        size: int = _POOL_SIZE,
+        idle_seconds: float = _POOL_IDLE_SECONDS,
+        max_age_seconds: float = _POOL_MAX_AGE_SECONDS,
+        check_after_seconds: float = _POOL_CHECK_AFTER_SECONDS,
+    ):
+        self._connect = connect
+        self._size = max(1, size)
+        self._idle_seconds = idle_seconds
+        self._max_age_seconds = max_age_seconds
+        self._check_after_seconds = check_after_seconds
+        self._idle: deque[_PooledConnection] = deque()
+        self._open = 0  # idle + checked out + being created
+        self._generation = 0  # bumped by close_all so checked-out connections are not returned
+        self._cond = threading.Condition()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "evicted_idle": 0,
+            "evicted_age": 0,
+            "health_check_failures": 0,
+            "discarded": 0,
+            "waits": 0,
+        }
+
+    def _expired(self, entry: _PooledConnection, now: float) -> str | None:
+        if now - entry.created_at >= self._max_age_seconds:
+            return "evicted_age"
+        if now - entry.last_used >= self._idle_seconds:
+            return "evicted_idle"
+        return None
+
+    def _evict_expired_locked(self, now: float) -> list:
+        """Drop expired idle entries; returns connections to close outside the lock."""
+        keep, dropped = deque(), []
+        for entry in self._idle:
+            reason = self._expired(entry, now)
+            if reason:
+                self._stats[reason] += 1
+                self._open -= 1
+                dropped.append(entry.conn)
+            else:
+                keep.append(entry)
+        self._idle = keep
+        if dropped:
+            self._cond.notify_all()
+        return dropped
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(conn) -> bool:
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float = _POOL_ACQUIRE_TIMEOUT_SECONDS) -> _PooledConnection:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                to_close = self._evict_expired_locked(time.monotonic())
+                entry, create = None, False
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO keeps the warmest connection in use
+                elif self._open < self._size:
+                    self._open += 1
+                    create = True
+                    generation = self._generation
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"Timed out after {timeout:.0f}s waiting for a warehouse connection "
+                            f"(pool size {self._size})."
+                        )
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+            for conn in to_close:
+                self._close_quietly(conn)
+            if create:
+                try:
+                    entry = _PooledConnection(self._connect(), generation)
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+                return entry
+            if entry is None:
+                continue
+            if time.monotonic() - entry.last_used >= self._check_after_seconds and not self._healthy(entry.conn):
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                self.release(entry, discard=True)
+                continue
+            with self._cond:
+                self._stats["reused"] += 1
+            return entry
+
+    def release(self, entry: _PooledConnection, discard: bool = False) -> None:
+        with self._cond:
+            discard = discard or entry.generation != self._generation
+            if discard:
+                self._open -= 1
+                self._stats["discarded"] += 1
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+        if discard:
+            self._close_quietly(entry.conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection; it is discarded instead of returned if the block raises."""
+        with span("pool.acquire"):
+            entry = self.acquire()
+        try:
+            yield entry.conn
+        except BaseException:
+            self.release(entry, discard=True)
+            raise
+        else:
+            self.release(entry)
+
+    def close_all(self) -> None:
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._generation += 1
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self._size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+            }
 
 
-def get_income_latency_timeseries(region: str | None = None) -> pd.DataFrame:
-    where = f" AND region = '{region}'" if region and region != "All" else ""
-    q = f"""
+# Query registry: every warehouse query is a named template with bound parameters. Catalog/schema are
+# fixed per process, so each name maps to one stable SQL text for all regions, which lets the warehouse
+# reuse cached plans/results. Region filters use the 'All' sentinel rather than NULL parameters.
+_QUERY_TEMPLATES = {
+    "regions": """
+    SELECT DISTINCT COALESCE(region, 'All') AS region
+    FROM {catalog}.{schema}.gold_snap_per_timeseries
+    ORDER BY region
+    """,
+    "per_timeseries": """
+    SELECT month_start, region, per_rate, overpayment_usd, issued_benefits_usd
+    FROM {catalog}.{schema}.gold_snap_per_timeseries
+    WHERE (:region = 'All' OR region = :region)
+    ORDER BY month_start
+    """,
+    "latency_timeseries": """
     SELECT week_start AS month_start, region, median_latency_days, p90_latency_days
-    FROM {_CATALOG}.{_SCHEMA}.gold_income_latency_timeseries
-    WHERE 1=1 {where}
+    FROM {catalog}.{schema}.gold_income_latency_timeseries
+    WHERE (:region = 'All' OR region = :region)
     ORDER BY week_start
-    """
-    return _run_query(q)
+    """,
+    "per_since": """
+    SELECT month_start, region, per_rate, overpayment_usd, issued_benefits_usd
+    FROM {catalog}.{schema}.gold_snap_per_timeseries
+    WHERE month_start >= :since
+    ORDER BY month_start
+    """,
+    "latency_since": """
+    SELECT week_start AS month_start, region, median_latency_days, p90_latency_days
+    FROM {catalog}.{schema}.gold_income_latency_timeseries
+    WHERE week_start >= :since
+    ORDER BY week_start
+    """,
+    # One region's rows from its own watermark (statewide NULL-region rows under 'All'), for regions whose
+    # watermark lags the table-wide refresh window.
+    "per_region_since": """
+    SELECT month_start, region, per_rate, overpayment_usd, issued_benefits_usd
+    FROM {catalog}.{schema}.gold_snap_per_timeseries
+    WHERE COALESCE(region, 'All') = :region AND month_start >= :since
+    ORDER BY month_start
+    """,
+    "latency_region_since": """
+    SELECT week_start AS month_start, region, median_latency_days, p90_latency_days
+    FROM {catalog}.{schema}.gold_income_latency_timeseries
+    WHERE COALESCE(region, 'All') = :region AND week_start >= :since
+    ORDER BY week_start
+    """,
+    "roi_curve": """
+    SELECT month_start, per_rate_projected, projected_penalty_exposure_usd
+    FROM (
+        SELECT month_start, per_rate_projected, projected_penalty_exposure_usd,
+               ROW_NUMBER() OVER (PARTITION BY per_rate_projected ORDER BY month_start DESC) AS rn
+        FROM {catalog}.{schema}.gold_snap_roi_scenarios
+    )
+    WHERE rn = 1
+    ORDER BY per_rate_projected
+    """,
+    "roi_history": """
+    SELECT month_start, per_rate_projected, projected_penalty_exposure_usd
+    FROM {catalog}.{schema}.gold_snap_roi_scenarios
+    ORDER BY month_start, per_rate_projected
+    """,
+    # For 'All', each period is first folded to one statewide row the way the charts build it: the table's
+    # own statewide (NULL/'All' region) rows when it has them, else dollars summed, per_rate weighted by
+    # issued benefits (aggregate_per_all) and latency averaged with each region weighing equally
+    # (_fold_latency_statewide). Periods are then unique, so latest/previous are deterministic.
+    "kpi_summary": """
+    WITH per_rows AS (
+        SELECT month_start, per_rate, overpayment_usd, issued_benefits_usd,
+               COALESCE(region, 'All') = 'All' AS statewide
+        FROM {catalog}.{schema}.gold_snap_per_timeseries
+        WHERE (:region = 'All' OR region = :region)
+    ),
+    per AS (
+        SELECT month_start,
+               CASE WHEN SUM(issued_benefits_usd) > 0
+                    THEN SUM(per_rate * issued_benefits_usd) / SUM(issued_benefits_usd)
+                    ELSE AVG(per_rate) END AS per_rate,
+               SUM(overpayment_usd) AS overpayment_usd,
+               SUM(issued_benefits_usd) AS issued_benefits_usd,
+               ROW_NUMBER() OVER (ORDER BY month_start DESC) AS rn
+        FROM per_rows
+        WHERE statewide OR NOT EXISTS (SELECT 1 FROM per_rows WHERE statewide)
+        GROUP BY month_start
+    ),
+    lat_rows AS (
+        SELECT week_start, median_latency_days, p90_latency_days,
+               COALESCE(region, 'All') = 'All' AS statewide
+        FROM {catalog}.{schema}.gold_income_latency_timeseries
+        WHERE (:region = 'All' OR region = :region)
+    ),
+    lat AS (
+        SELECT AVG(median_latency_days) AS median_latency_days, AVG(p90_latency_days) AS p90_latency_days,
+               ROW_NUMBER() OVER (ORDER BY week_start DESC) AS rn
+        FROM lat_rows
+        WHERE statewide OR NOT EXISTS (SELECT 1 FROM lat_rows WHERE statewide)
+        GROUP BY week_start
+    ),
+    per_agg AS (
+        SELECT
+            MAX(CASE WHEN rn = 1 THEN per_rate END) AS current_per,
+            COALESCE(MAX(CASE WHEN rn = 2 THEN per_rate END), MAX(CASE WHEN rn = 1 THEN per_rate END)) AS prev_per,
+            SUM(issued_benefits_usd) AS benefits_issued_usd,
+            SUM(overpayment_usd) AS total_overpayment_usd,
+            COUNT(*) AS n_months
+        FROM per
+    )
+    SELECT per_agg.*, lat.median_latency_days, lat.p90_latency_days
+    FROM per_agg
+    LEFT JOIN lat ON lat.rn = 1
+    """,
+    **{
+        f"version:{table}": f"DESCRIBE HISTORY {{catalog}}.{{schema}}.{table} LIMIT 1"
+        for table in _TABLES
+    },
+    # Whole-table reads, used only to export local snapshots (dashboard_data_local).
+    **{f"table:{table}": f"SELECT * FROM {{catalog}}.{{schema}}.{table}" for table in _TABLES},
+}
 
 
-def get_roi_scenario(target_per: float) -> dict:
-    q = f"""
-    SELECT per_rate_projected, projected_penalty_exposure_usd
-    FROM {_CATALOG}.{_SCHEMA}.gold_snap_roi_scenarios
-    WHERE per_rate_projected = {target_per}
-    ORDER BY month_start DESC
-    LIMIT 1
-    """
-    df = _run_query(q)
-    if df.empty:
-        return {
-            "target_per": target_per,
-            "projected_penalty_exposure_usd": 0,
-            "penalty_reduction_usd": 0,
-            "below_threshold": target_per < 6.0,
-        }
-    row = df.iloc[0]
-    # Assume current from KPI; reduction = current - projected
-    current = float(os.getenv("CURRENT_PENALTY_EXPOSURE", "10900000"))
-    projected = float(row["projected_penalty_exposure_usd"])
+def _render_queries(catalog: str, schema: str) -> dict[str, str]:
+    for ident in (catalog, schema):
+        if not _IDENTIFIER.match(ident):
+            raise RuntimeError(f"Invalid SNAP_CATALOG/SNAP_SCHEMA identifier: {ident!r}")
     return {
-        "target_per": target_per,
-        "projected_penalty_exposure_usd": projected,
-        "penalty_reduction_usd": max(0, current - projected),
-        "below_threshold": target_per < 6.0,
+        name: textwrap.dedent(template.format(catalog=catalog, schema=schema)).strip()
+        for name, template in _QUERY_TEMPLATES.items()
     }
 
 
-def get_kpi_summary(region: str | None = None) -> dict:
-    per_df = get_per_timeseries(region)
-    lat_df = get_income_latency_timeseries(region)
-    if per_df.empty:
-        return {
-            "current_per": 0.0,
-            "per_delta_pp": 0.0,
-            "benefits_issued_usd": 0.0,
-            "median_latency_days": 0,
-            "p90_latency_days": 0,
-            "total_overpayment_usd": 0.0,
+def _fingerprint(sql_text: str) -> str:
+    return hashlib.sha256(" ".join(sql_text.split()).encode()).hexdigest()[:16]
+
+
+QUERIES = _render_queries(_CATALOG, _SCHEMA)
+QUERY_FINGERPRINTS = {name: _fingerprint(q) for name, q in QUERIES.items()}
+
+
+def _region_param(region: str | None) -> str:
+    return region if region else "All"
+
+
+_LATENCY_VALUES = ["median_latency_days", "p90_latency_days"]
+_LATENCY_COLUMNS = ["month_start", "region", *_LATENCY_VALUES]  # the latency queries' column order
+
+
+def _fold_latency_statewide(batches) -> pd.DataFrame:
+    """
+    Statewide latency per period, folded from every region's rows as they arrive: the table's own statewide
+    rows (NULL/'All' region) when it has them, else each region weighted equally (as the region store does).
+    """
+    fold = MeanFold(["statewide", "month_start"], _LATENCY_VALUES)
+    for df in batches:
+        fold.add(df.assign(statewide=df["region"].isna() | (df["region"] == "All")))
+    out = fold.result()
+    statewide = out["statewide"].to_numpy(dtype=bool)
+    out = out[statewide] if statewide.any() else out
+    return out.assign(region="All").reset_index(drop=True)[_LATENCY_COLUMNS]
+
+
+def _execute(conn, query: str, params: dict | None = None, fold=None) -> pd.DataFrame:
+    """Whole result as a DataFrame, or fold(batches) when the result is streamed into a reduction."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params or None)
+        return fetch_frame(cursor) if fold is None else fold(iter_batches(cursor))
+    finally:
+        cursor.close()
+
+
+class SqlBackend:
+    """
+    The dashboard data functions over the query registry, executed on a ConnectionPool.
+    `queries` is the registry rendered in the engine's SQL dialect (default: the warehouse's own). Metrics
+    are keyed by registry name and the warehouse SQL fingerprint, so every engine reports the same ones.
+    Identical concurrent queries (same SQL and parameters, e.g. many sessions opening at once) share one
+    execution and its result or error. Statewide latency is streamed and folded to one row per period as
+    batches arrive, so its peak memory is one batch plus the folded rows (dashboard_fetch.MeanFold).
+    """
+
+    def __init__(self, pool: ConnectionPool, queries: dict[str, str] | None = None):
+        self.pool = pool
+        self.queries = QUERIES if queries is None else queries
+        self._query_stats = {
+            name: {"calls": 0, "coalesced": 0, "errors": 0, "seconds": 0.0} for name in self.queries
         }
-    latest_per = per_df.iloc[-1]
-    prev_per = per_df.iloc[-2]["per_rate"] if len(per_df) >= 2 else latest_per["per_rate"]
-    benefits = per_df["issued_benefits_usd"].sum()
-    overpayment = per_df["overpayment_usd"].sum()
-    median_lat = int(lat_df.iloc[-1]["median_latency_days"]) if not lat_df.empty else 0
-    p90_lat = int(lat_df.iloc[-1]["p90_latency_days"]) if not lat_df.empty else 0
-    return {
-        "current_per": round(float(latest_per["per_rate"]), 1),
-        "per_delta_pp": round(float(latest_per["per_rate"] - prev_per), 2),
-        "benefits_issued_usd": float(benefits),
-        "median_latency_days": median_lat,
-        "p90_latency_days": p90_lat,
-        "total_overpayment_usd": float(overpayment),
-    }
+        self._query_stats_lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def get_pool_stats(self) -> dict:
+        """Counters for the shared connection pool (created, reused, evictions, in_use, idle, ...)."""
+        return self.pool.stats()
+
+    def get_query_stats(self) -> dict:
+        """
+        Per named query: fingerprint, calls, calls coalesced onto an in-flight query (whether it succeeded or
+        failed), failed executions, cumulative seconds.
+        """
+        with self._query_stats_lock:
+            return {
+                name: {"fingerprint": QUERY_FINGERPRINTS[name], **stats}
+                for name, stats in self._query_stats.items()
+            }
+
+    def get_coalescing_stats(self) -> dict:
+        """Warehouse executions vs calls that joined one already in flight."""
+        return self._flight.stats()
+
+    def _run_query(self, query: str, params: dict | None = None, fold=None) -> tuple[pd.DataFrame, bool]:
+        """(result, shared): runs the query, or waits for an identical one (same fold) already in flight."""
+        key = (query, tuple(sorted((params or {}).items())), fold)
+        return self._flight.do(key, self._execute_with_retry, query, params, fold)
+
+    def _execute_with_retry(self, query: str, params: dict | None = None, fold=None) -> pd.DataFrame:
+        try:
+            with self.pool.connection() as conn:
+                return _execute(conn, query, params, fold)
+        except Exception as exc:
+            if not _is_auth_error(exc):
+                raise
+        # Token expired mid-session: drop pooled sessions and retry once on a fresh connection.
+        self.pool.close_all()
+        with self.pool.connection() as conn:
+            return _execute(conn, query, params, fold)
+
+    def run_named(self, name: str, fold=None, **params) -> pd.DataFrame:
+        """
+        Single execution path for registry queries: bound parameters, per-fingerprint metrics. With `fold`,
+        the result is streamed in batches (dashboard_fetch.iter_batches) and fold(batches) is returned.
+        """
+        query = self.queries[name]
+        start = time.perf_counter()
+        failed = shared = False
+        try:
+            attrs = {"query": name, "fingerprint": QUERY_FINGERPRINTS[name], "streamed": fold is not None}
+            with span("warehouse.query", **attrs) as sp:
+                df, shared = self._run_query(query, params, fold)
+                sp.set(coalesced=shared, **frame_attrs(df))
+                return df
+        except Exception:
+            # A waiter that received the leader's error is a coalesced call, not another failed execution.
+            failed = True
+            shared = self._flight.shared()
+            raise
+        finally:
+            with self._query_stats_lock:
+                stats = self._query_stats[name]
+                stats["calls"] += 1
+                stats["coalesced"] += shared
+                stats["errors"] += failed and not shared
+                stats["seconds"] += time.perf_counter() - start
+
+    def get_regions(self) -> list[str]:
+        df = self.run_named("regions")
+        return ["All"] + df["region"].astype(str).tolist()
+
+    def get_per_timeseries(self, region: str | None = None) -> pd.DataFrame:
+        return self.run_named("per_timeseries", region=_region_param(region))
+
+    def get_income_latency_timeseries(self, region: str | None = None) -> pd.DataFrame:
+        """One region's weekly latency; for "All", every region's rows folded into one statewide series."""
+        region = _region_param(region)
+        fold = _fold_latency_statewide if region == "All" else None  # one region is already at chart grain
+        return self.run_named("latency_timeseries", fold=fold, region=region)
+
+    def get_per_all_regions(self, since=None, region: str | None = None) -> pd.DataFrame:
+        """
+        PER rows for every region (only month_start >= since when given) for the in-memory region store;
+        with `region` (and since), only that region's rows ("All": the statewide rows).
+        """
+        if region is not None:
+            return self.run_named("per_region_since", region=region, since=pd.Timestamp(since).date())
+        if since is None:
+            return self.get_per_timeseries(None)
+        return self.run_named("per_since", since=pd.Timestamp(since).date())
+
+    def get_latency_all_regions(self, since=None, region: str | None = None) -> pd.DataFrame:
+        """Latency rows for every region (only week_start >= since when given), or one `region`'s, like PER."""
+        if region is not None:
+            return self.run_named("latency_region_since", region=region, since=pd.Timestamp(since).date())
+        if since is None:
+            return self.run_named("latency_timeseries", region="All")
+        return self.run_named("latency_since", since=pd.Timestamp(since).date())
+
+    def get_roi_curve(self) -> pd.DataFrame:
+        """Full scenario curve: latest month_start row per per_rate_projected, ordered by rate."""
+        return self.run_named("roi_curve")
+
+    def get_roi_history(self) -> pd.DataFrame:
+        """Every month's scenario curve (month_start, per_rate_projected, exposure), for dated targets."""
+        return self.run_named("roi_history")
+
+    def get_roi_scenario(self, target_per: float) -> dict:
+        # Interpolate on the curve rather than matching per_rate_projected = target_per exactly
+        curve = build_curve(normalize(ROI_TABLE, self.get_roi_curve(), RATE_UNITS[ROI_TABLE]))
+        return scenario_from_curve(curve, target_per)
+
+    def get_kpi_summary(self, region: str | None = None) -> dict:
+        """
+        KPIs in one aggregate query: latest/previous PER by ROW_NUMBER, SUM totals, latest latency row, over
+        the same statewide series as the charts for "All". Returns a single row instead of pulling both time
+        series into pandas.
+        """
+        df = self.run_named("kpi_summary", region=_region_param(region))
+        return kpi_from_row(df.iloc[0]) if not df.empty else dict(EMPTY_KPI)
+
+    def get_table_versions(self) -> dict[str, int]:
+        """Latest Delta version of each gold table (DESCRIBE HISTORY ... LIMIT 1)."""
+        versions = {}
+        for table in _TABLES:
+            df = self.run_named(f"version:{table}")
+            versions[table] = int(df.iloc[0]["version"]) if not df.empty else -1
+        return versions
+
+
+_backend = SqlBackend(ConnectionPool(_get_conn))
+
+# Module API (the dashboard_backend.Backend protocol), bound to the warehouse backend.
+run_named = _backend.run_named
+get_pool_stats = _backend.get_pool_stats
+get_query_stats = _backend.get_query_stats
+get_coalescing_stats = _backend.get_coalescing_stats
+get_regions = _backend.get_regions
+get_per_timeseries = _backend.get_per_timeseries
+get_income_latency_timeseries = _backend.get_income_latency_timeseries
+get_per_all_regions = _backend.get_per_all_regions
+get_latency_all_regions = _backend.get_latency_all_regions
+get_roi_curve = _backend.get_roi_curve
+get_roi_history = _backend.get_roi_history
+get_roi_scenario = _backend.get_roi_scenario
+get_kpi_summary = _backend.get_kpi_summary
+get_table_versions = _backend.get_table_versions
@@ -0,0 +1,37 @@
+"""
+Bounded, process-wide thread pool for warehouse queries.
+Every session submits to the same executor, so at most SNAP_QUERY_WORKERS queries hit the warehouse at once.
+Do not wait on a future from inside a task running on this executor (it can deadlock when all workers wait).
+"""
+import contextvars
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+MAX_WORKERS = int(os.getenv("SNAP_QUERY_WORKERS", "4"))
+PANEL_TIMEOUT_SECONDS = float(os.getenv("SNAP_PANEL_TIMEOUT_SECONDS", "20"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="snap-query")
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    # Run in a copy of the caller's context so trace spans from worker threads join the caller's render.
+    return _executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def panel_deadline(timeout: float | None = None) -> float:
+    """Monotonic deadline shared by all panels of one render."""
+    return time.monotonic() + (PANEL_TIMEOUT_SECONDS if timeout is None else timeout)
+
+
+def panel_result(future: Future, default, deadline: float) -> tuple[object, str | None]:
+    """
+    Wait for a panel's future until `deadline`. Returns (value, None) on success or (default, reason)
+    on timeout/error so one slow or failing table degrades its panel instead of the whole page.
+    """
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic())), None
+    except FutureTimeoutError:
+        return default, "timed out"
+    except Exception as exc:
+        return default, f"{type(exc).__name__}: {exc}"
@@ -0,0 +1,123 @@
+"""
+Cursor -> DataFrame conversion for warehouse results.
+Results are fetched as Arrow (cursor.fetchall_arrow) and converted to pandas column-wise, with column
+types resolved once here: decimals become float64, dates/timestamps become naive UTC datetime64.
+Falls back to row tuples when pyarrow or the Arrow fetch API is unavailable.
+Large results can instead be streamed in batches (iter_batches) and folded into group aggregates as they
+arrive (MeanFold), so only one batch and the folded groups are in memory, under SNAP_FETCH_MAX_MB.
+"""
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow ships with databricks-sql-connector
+    pa = None
+
+FETCH_BATCH_ROWS = int(os.getenv("SNAP_FETCH_BATCH_ROWS", "50000"))
+FETCH_MAX_BYTES = int(float(os.getenv("SNAP_FETCH_MAX_MB", "256")) * 2**20)
+
+
+def _resolve_type(arr):
+    t = arr.type
+    if pa.types.is_decimal(t):
+        return pc.cast(arr, pa.float64())
+    if pa.types.is_timestamp(t) and t.tz is not None:
+        return pc.cast(arr, pa.timestamp(t.unit))  # stored as UTC, drop the zone
+    if pa.types.is_date(t):
+        return pc.cast(arr, pa.timestamp("ms"))
+    return arr
+
+
+def arrow_to_frame(table) -> pd.DataFrame:
+    """Resolve column types on the Arrow table, then convert without per-row Python objects."""
+    columns = [_resolve_type(col) for col in table.columns]
+    table = pa.Table.from_arrays(columns, names=table.column_names)
+    # split_blocks + self_destruct let pandas take Arrow buffers column by column, avoiding a consolidation copy
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def fetch_frame(cursor) -> pd.DataFrame:
+    """Read the whole result of an executed cursor into a DataFrame."""
+    if pa is not None and hasattr(cursor, "fetchall_arrow"):
+        return arrow_to_frame(cursor.fetchall_arrow())
+    columns = [d[0] for d in cursor.description]
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+
+def iter_batches(cursor, batch_rows: int = FETCH_BATCH_ROWS):
+    """The result of an executed cursor as DataFrames of at most batch_rows rows, fetched one at a time."""
+    if pa is not None and hasattr(cursor, "fetchmany_arrow"):
+        while True:
+            table = cursor.fetchmany_arrow(batch_rows)
+            if table.num_rows == 0:
+                return
+            yield arrow_to_frame(table)
+    columns = [d[0] for d in cursor.description]
+    while rows := cursor.fetchmany(batch_rows):
+        yield pd.DataFrame.from_records(rows, columns=columns)
+
+
+def _nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MeanFold:
+    """
+    Streaming group-by mean of `values` over the `by` columns (NULL keys form their own group). Each batch
+    is reduced to per-group sums and non-null counts; partials are merged once they outgrow the merged
+    state, so merging stays amortized. Raises RuntimeError if the merged groups alone exceed max_bytes.
+    """
+
+    def __init__(self, by: list[str], values: list[str], max_bytes: int = FETCH_MAX_BYTES):
+        self.by = list(by)
+        self.values = list(values)
+        self.max_bytes = max_bytes
+        self._state = None
+        self._state_bytes = 0
+        self._pending: list[pd.DataFrame] = []
+        self._pending_bytes = 0
+        self._stats = {"batches": 0, "rows": 0, "peak_bytes": 0}
+
+    def add(self, df: pd.DataFrame) -> None:
+        df = df.assign(**{v: pd.to_numeric(df[v], errors="coerce") for v in self.values})  # Decimal rows
+        g = df.groupby(self.by, sort=False, dropna=False, observed=True)[self.values]
+        part = pd.concat([g.sum(), g.count().add_suffix("__n")], axis=1)
+        self._pending.append(part)
+        self._pending_bytes += _nbytes(part)
+        self._stats["batches"] += 1
+        self._stats["rows"] += len(df)
+        self._stats["peak_bytes"] = max(self._stats["peak_bytes"], self._state_bytes + self._pending_bytes + _nbytes(df))
+        if self._pending_bytes >= self._state_bytes or self._state_bytes + self._pending_bytes > self.max_bytes:
+            self._merge()
+
+    def _merge(self) -> None:
+        if not self._pending:
+            return
+        parts = self._pending if self._state is None else [self._state, *self._pending]
+        self._pending, self._pending_bytes = [], 0
+        merged = pd.concat(parts)
+        self._state = merged.groupby(level=list(range(len(self.by))), sort=False, dropna=False).sum()
+        self._state_bytes = _nbytes(self._state)
+        if self._state_bytes > self.max_bytes:
+            raise RuntimeError(
+                f"Streaming fetch holds {self._state_bytes / 2**20:.1f} MB of {', '.join(self.by)} groups, "
+                f"over the {self.max_bytes / 2**20:.1f} MB ceiling (SNAP_FETCH_MAX_MB)."
+            )
+
+    def result(self) -> pd.DataFrame:
+        """One row per group: the `by` columns, then the mean of each value column, ordered by `by`."""
+        self._merge()
+        if self._state is None:
+            return pd.DataFrame(columns=self.by + self.values)
+        out = pd.DataFrame(
+            {v: self._state[v] / self._state[f"{v}__n"].where(self._state[f"{v}__n"] > 0) for v in self.values}
+        )
+        return out.reset_index().sort_values(self.by, kind="stable", ignore_index=True)
+
+    def stats(self) -> dict:
+        """batches and rows folded, groups held, and the peak bytes of one batch plus partials."""
+        groups = 0 if self._state is None else len(self._state)
+        return {**self._stats, "groups": groups}
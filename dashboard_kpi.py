@@ -0,0 +1,77 @@
+"""
+KPI row semantics shared by every backend.
+The real backend computes these in one aggregate SQL query; kpi_from_frames is the in-process
+reference over PER/latency frames (ordered by month_start), so both paths can be cross-checked.
+"""
+import pandas as pd
+
+EMPTY_KPI = {
+    "current_per": 0.0,
+    "per_delta_pp": 0.0,
+    "benefits_issued_usd": 0.0,
+    "median_latency_days": 0,
+    "p90_latency_days": 0,
+    "total_overpayment_usd": 0.0,
+}
+
+
+def kpi_from_row(row) -> dict:
+    """
+    Build the KPI dict from one aggregate row with current_per, prev_per, benefits_issued_usd,
+    total_overpayment_usd, median_latency_days, p90_latency_days and n_months.
+    """
+    if not row["n_months"]:
+        return dict(EMPTY_KPI)
+    median_lat = row["median_latency_days"]
+    p90_lat = row["p90_latency_days"]
+    return {
+        "current_per": float(row["current_per"]),
+        "per_delta_pp": float(row["current_per"] - row["prev_per"]),
+        "benefits_issued_usd": float(row["benefits_issued_usd"]),
+        "median_latency_days": int(median_lat) if pd.notna(median_lat) else 0,
+        "p90_latency_days": int(p90_lat) if pd.notna(p90_lat) else 0,
+        "total_overpayment_usd": float(row["total_overpayment_usd"]),
+    }
+
+
+def kpi_frame(per_df: pd.DataFrame, lat_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    kpi_from_frames for every region at once: one row per region of per_df (index region) with the same
+    KPI columns, computed with groupby over multi-region frames ordered by (region, month_start).
+    """
+    columns = list(EMPTY_KPI)
+    if per_df.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="region"))
+    per = per_df.groupby("region", observed=True, sort=False)
+    last = per.nth(-1).set_index("region")
+    current = last["per_rate"].astype(float)
+    prev = per.nth(-2).set_index("region")["per_rate"].astype(float).reindex(current.index)
+    totals = per[["issued_benefits_usd", "overpayment_usd"]].sum().reindex(current.index)
+    out = pd.DataFrame({
+        "current_per": current,
+        "per_delta_pp": current - prev.fillna(current),
+        "benefits_issued_usd": totals["issued_benefits_usd"],
+        "total_overpayment_usd": totals["overpayment_usd"],
+    })
+    latest_lat = lat_df.groupby("region", observed=True, sort=False).nth(-1).set_index("region")
+    for col in ("median_latency_days", "p90_latency_days"):
+        out[col] = latest_lat[col].reindex(current.index).fillna(0).astype(int) if not lat_df.empty else 0
+    out.index.name = "region"
+    return out[columns]
+
+
+def kpi_from_frames(per_df: pd.DataFrame, lat_df: pd.DataFrame) -> dict:
+    """Latest and previous PER, period totals, and the latest latency row from already-fetched frames."""
+    if per_df.empty:
+        return dict(EMPTY_KPI)
+    latest = per_df.iloc[-1]
+    has_lat = not lat_df.empty
+    return kpi_from_row({
+        "n_months": len(per_df),
+        "current_per": latest["per_rate"],
+        "prev_per": per_df.iloc[-2]["per_rate"] if len(per_df) >= 2 else latest["per_rate"],
+        "benefits_issued_usd": per_df["issued_benefits_usd"].sum(),
+        "total_overpayment_usd": per_df["overpayment_usd"].sum(),
+        "median_latency_days": lat_df.iloc[-1]["median_latency_days"] if has_lat else None,
+        "p90_latency_days": lat_df.iloc[-1]["p90_latency_days"] if has_lat else None,
+    })
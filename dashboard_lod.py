@@ -0,0 +1,75 @@
+"""
+Level-of-detail for long time series charts.
+Largest-Triangle-Three-Buckets (LTTB) downsampling to a point budget, while forcing in the points that
+carry meaning on these charts: series ends, the samples around event markers, and threshold crossings.
+Pure numpy; x is any increasing numeric axis (the chart builders pass epoch-ms).
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the n_out points LTTB keeps (always including the first and last)."""
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (n_out - 2)  # bucket width; the first and last points are fixed
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        nhi = min(int((i + 2) * every) + 1, n)
+        cx, cy = x[hi:nhi].mean(), y[hi:nhi].mean()  # average of the next bucket
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + (int(np.nanargmax(area)) if np.isfinite(area).any() else 0)
+        out[i + 1] = a
+    return out
+
+
+def event_indices(x: np.ndarray, events) -> np.ndarray:
+    """For each event x inside the series, the samples on either side of it."""
+    x = np.asarray(x, dtype=float)
+    if len(x) == 0:
+        return np.empty(0, dtype=int)
+    events = np.asarray([e for e in events if x[0] <= e <= x[-1]], dtype=float)
+    pos = np.searchsorted(x, events)
+    return np.unique(np.clip(np.concatenate([pos - 1, pos]), 0, len(x) - 1))
+
+
+def crossing_indices(y: np.ndarray, threshold: float) -> np.ndarray:
+    """Both samples of every segment where y crosses (or touches) threshold."""
+    side = np.sign(np.asarray(y, dtype=float) - threshold)
+    i = np.flatnonzero(side[:-1] != side[1:])
+    return np.unique(np.concatenate([i, i + 1]))
+
+
+def decimate(
+    x: np.ndarray,
+    ys: list[np.ndarray],
+    max_points: int,
+    keep: np.ndarray | None = None,
+    soft_keep: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Sorted indices to plot for series sharing x. `keep` (ends, event markers) is always included;
+    `soft_keep` (threshold crossings) is thinned evenly to at most half the budget, so a noisy series
+    hovering at the threshold cannot blow the budget; LTTB fills the rest, split across the series.
+    Returns every index when x already fits in max_points.
+    """
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    keep = np.empty(0, dtype=int) if keep is None else np.asarray(keep, dtype=int)
+    soft = np.empty(0, dtype=int) if soft_keep is None else np.asarray(soft_keep, dtype=int)
+    cap = max_points // 2
+    if len(soft) > cap:
+        soft = soft[np.linspace(0, len(soft) - 1, cap).astype(int)]
+    per_series = max(3, (max_points - len(keep) - len(soft)) // max(1, len(ys)))
+    picks = [lttb_indices(x, y, per_series) for y in ys]
+    return np.unique(np.concatenate([keep, soft, *picks, [0, n - 1]]))
@@ -0,0 +1,139 @@
+"""
+ROI scenario curve: gold_snap_roi_scenarios loaded once into sorted arrays and answered by interpolation.
+scenario_frame answers whole arrays of targets in one vectorized pass (curves, strategy comparisons).
+Pure functions only, so the simulator math can be exercised without a warehouse.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+PER_THRESHOLD = 6.0
+
+
+def current_penalty_exposure() -> float:
+    return float(os.getenv("CURRENT_PENALTY_EXPOSURE", "10900000"))
+
+
+def build_curve(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (rates, exposures) sorted by rate, one point per per_rate_projected, from a normalized
+    (dashboard_schema) curve frame whose rates are already in percent, like the slider.
+    """
+    if df.empty:
+        return np.empty(0), np.empty(0)
+    # float32 rates rounded back to 6 decimals, so slider values (5.8) land exactly on curve points
+    rates = np.round(df["per_rate_projected"].to_numpy(dtype=float), 6)
+    exposures = df["projected_penalty_exposure_usd"].to_numpy(dtype=float)
+    keep = ~(np.isnan(rates) | np.isnan(exposures))
+    rates, exposures = rates[keep], exposures[keep]
+    order = np.argsort(rates, kind="stable")
+    rates, exposures = rates[order], exposures[order]
+    # Duplicate rates: keep the last one (callers pass latest month_start per rate anyway)
+    last = np.append(rates[1:] != rates[:-1], True)
+    return rates[last], exposures[last]
+
+
+def interpolate(rates: np.ndarray, values: np.ndarray, target):
+    """
+    Linear interpolation of values at target (scalar or array) by binary search over sorted rates.
+    Targets outside the curve clamp to its end points; an empty curve yields NaN.
+    """
+    target = np.asarray(target, dtype=float)
+    if rates.size == 0:
+        return np.full(target.shape, np.nan) if target.ndim else float("nan")
+    if rates.size == 1:
+        out = np.full(target.shape, values[0])
+        return out if target.ndim else float(out)
+    t = np.clip(target, rates[0], rates[-1])
+    hi = np.clip(np.searchsorted(rates, t, side="left"), 1, rates.size - 1)
+    lo = hi - 1
+    frac = (t - rates[lo]) / (rates[hi] - rates[lo])
+    out = values[lo] + frac * (values[hi] - values[lo])
+    return out if target.ndim else float(out)
+
+
+def curves_by_month(df: pd.DataFrame) -> tuple[np.ndarray, list[tuple[np.ndarray, np.ndarray]]]:
+    """(months, curves): the scenario curve of every month_start in a history frame, months sorted."""
+    months, curves = [], []
+    for month, group in df.groupby("month_start", sort=True):
+        months.append(month)
+        curves.append(build_curve(group))
+    return pd.to_datetime(months).to_numpy(), curves
+
+
+def curve_index(months: np.ndarray, by) -> np.ndarray:
+    """Index of the latest month <= each date in `by` (earlier dates use the first month)."""
+    by = pd.to_datetime(np.atleast_1d(by)).to_numpy(dtype=months.dtype)
+    return np.clip(np.searchsorted(months, by, side="right") - 1, 0, months.size - 1)
+
+
+def scenario_from_curve(curve: tuple[np.ndarray, np.ndarray], target_per: float) -> dict:
+    """Same shape as get_roi_scenario: target_per, projected_penalty_exposure_usd, penalty_reduction_usd, below_threshold."""
+    rates, exposures = curve
+    if rates.size == 0:
+        return {
+            "target_per": target_per,
+            "projected_penalty_exposure_usd": 0,
+            "penalty_reduction_usd": 0,
+            "below_threshold": target_per < PER_THRESHOLD,
+        }
+    projected = interpolate(rates, exposures, target_per)
+    return {
+        "target_per": target_per,
+        "projected_penalty_exposure_usd": projected,
+        "penalty_reduction_usd": max(0, current_penalty_exposure() - projected),
+        "below_threshold": target_per < PER_THRESHOLD,
+    }
+
+
+def _broadcast(*arrays) -> list[np.ndarray]:
+    return [a.ravel() for a in np.broadcast_arrays(*(np.asarray(a) for a in arrays))]
+
+
+def _frame(targets: np.ndarray, baseline: np.ndarray, projected: np.ndarray, answered: np.ndarray) -> pd.DataFrame:
+    # Rows without a curve report 0 exposure and 0 reduction, like scenario_from_curve.
+    projected = np.where(answered, projected, 0.0)
+    return pd.DataFrame({
+        "target_per": targets,
+        "projected_penalty_exposure_usd": projected,
+        "penalty_reduction_usd": np.where(answered, np.maximum(0, baseline - projected), 0.0),
+        "below_threshold": targets < PER_THRESHOLD,
+    })
+
+
+def scenario_frame(curve: tuple[np.ndarray, np.ndarray], target_per, current_exposure=None) -> pd.DataFrame:
+    """
+    scenario_from_curve for arrays: target_per and current_exposure (default CURRENT_PENALTY_EXPOSURE;
+    e.g. one baseline per region) are broadcast together and answered in one pass, one row per pair.
+    """
+    baseline = current_penalty_exposure() if current_exposure is None else current_exposure
+    targets, baseline = _broadcast(np.asarray(target_per, dtype=float), np.asarray(baseline, dtype=float))
+    rates, exposures = curve
+    answered = np.full(targets.size, rates.size > 0)
+    projected = interpolate(rates, exposures, targets) if rates.size else np.zeros(targets.size)
+    return _frame(targets, baseline, projected, answered)
+
+
+def scenario_frame_by(months: np.ndarray, curves: list, target_per, by, current_exposure=None) -> pd.DataFrame:
+    """
+    scenario_frame with target dates ("5.8% by 2026-03"): `by` is broadcast with the targets and each row
+    is answered on the curve of the latest month_start <= its date (curves_by_month), reported as month_start.
+    """
+    baseline = current_penalty_exposure() if current_exposure is None else current_exposure
+    targets, baseline, dates = _broadcast(
+        np.asarray(target_per, dtype=float), np.asarray(baseline, dtype=float), pd.to_datetime(np.atleast_1d(by))
+    )
+    if not curves:
+        empty = np.zeros(targets.size)
+        return _frame(targets, baseline, empty, empty.astype(bool)).assign(month_start=pd.NaT)
+    idx = curve_index(months, dates)
+    projected = np.zeros(targets.size)
+    answered = np.zeros(targets.size, dtype=bool)
+    for i in np.unique(idx):  # one interpolation per distinct month, not per row
+        rows = idx == i
+        rates, exposures = curves[i]
+        if rates.size:
+            projected[rows] = interpolate(rates, exposures, targets[rows])
+            answered[rows] = True
+    return _frame(targets, baseline, projected, answered).assign(month_start=months[idx])
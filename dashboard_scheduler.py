@@ -0,0 +1,125 @@
+"""
+Background refresh scheduler.
+One daemon thread per process runs named jobs at their interval (± jitter so processes and tables do not
+refresh in lockstep) and retries failed jobs with exponential backoff capped at the interval. A job never
+overlaps itself; run_now() pulls a job forward instead of starting a second copy.
+"""
+import random
+import threading
+import time
+
+
+class _Job:
+    __slots__ = ("name", "fn", "interval", "next_run", "running", "failures", "runs", "last_error", "last_seconds")
+
+    def __init__(self, name: str, fn, interval):
+        self.name = name
+        self.fn = fn
+        self.interval = interval  # seconds, or a callable returning seconds (read at every reschedule)
+        self.next_run = 0.0
+        self.running = False
+        self.failures = 0
+        self.runs = 0
+        self.last_error = None
+        self.last_seconds = 0.0
+
+    def interval_seconds(self) -> float:
+        return float(self.interval() if callable(self.interval) else self.interval)
+
+
+class RefreshScheduler:
+    """Runs jobs on a daemon thread; jobs added before start() run immediately once started (prefetch)."""
+
+    def __init__(self, jitter: float = 0.1, retry_seconds: float = 30.0):
+        self._jitter = jitter
+        self._retry_seconds = retry_seconds
+        self._jobs: dict[str, _Job] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, name: str, fn, interval) -> None:
+        with self._cond:
+            self._jobs[name] = _Job(name, fn, interval)
+            self._cond.notify()
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def _delay_after(self, job: _Job) -> float:
+        interval = job.interval_seconds()
+        if job.failures == 0:
+            return self._jittered(interval)
+        backoff = self._retry_seconds * 2 ** (job.failures - 1)
+        return self._jittered(min(backoff, interval))
+
+    def run_now(self, name: str) -> None:
+        """Schedule a job for immediate execution (no-op while it is already running)."""
+        with self._cond:
+            job = self._jobs[name]
+            if not job.running:
+                job.next_run = 0.0
+                self._cond.notify()
+
+    def _next_due(self) -> _Job | None:
+        """Wait until a job is due and mark it running; None once stopped."""
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                idle = [j for j in self._jobs.values() if not j.running]
+                due = min(idle, key=lambda j: j.next_run, default=None)
+                if due is not None and due.next_run <= now:
+                    due.running = True
+                    return due
+                self._cond.wait(None if due is None else due.next_run - now)
+            return None
+
+    def _loop(self) -> None:
+        while (job := self._next_due()) is not None:
+            start = time.monotonic()
+            error = None
+            try:
+                job.fn()
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            with self._cond:
+                job.running = False
+                job.runs += 1
+                job.last_seconds = time.monotonic() - start
+                job.last_error = error
+                job.failures = job.failures + 1 if error else 0
+                job.next_run = time.monotonic() + self._delay_after(job)
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._loop, name="snap-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._cond:
+            return {
+                name: {
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "last_error": job.last_error,
+                    "last_seconds": round(job.last_seconds, 3),
+                    "next_in_seconds": round(max(0.0, job.next_run - now), 1),
+                    "running": job.running,
+                }
+                for name, job in self._jobs.items()
+            }
@@ -0,0 +1,100 @@
+"""
+Column schemas of the gold tables and the normalization every fetched frame goes through once.
+Frames leave the data layer validated and typed (rates float32 in percent, naive UTC datetime64 periods,
+categorical regions) and are cached that way, so charts and KPIs never coerce or rescale on a rerun.
+Rates are scaled from the unit the backend declares for each table (RATE_UNITS), never guessed from the values.
+"""
+import numpy as np
+import pandas as pd
+
+PER_TABLE = "gold_snap_per_timeseries"
+LATENCY_TABLE = "gold_income_latency_timeseries"
+ROI_TABLE = "gold_snap_roi_scenarios"
+
+# Column -> kind. "rate" columns are float32 percent; dollar totals stay float64 so sums do not drift.
+SCHEMAS = {
+    PER_TABLE: {
+        "month_start": "datetime",
+        "region": "region",
+        "per_rate": "rate",
+        "overpayment_usd": "float64",
+        "issued_benefits_usd": "float64",
+    },
+    LATENCY_TABLE: {
+        "month_start": "datetime",
+        "region": "region",
+        "median_latency_days": "float32",
+        "p90_latency_days": "float32",
+    },
+    ROI_TABLE: {
+        "month_start": "datetime",
+        "per_rate_projected": "rate",
+        "projected_penalty_exposure_usd": "float64",
+    },
+}
+
+# Backend RATE_UNITS value -> factor to percent.
+RATE_SCALES = {"fraction": 100.0, "percent": 1.0}
+
+_KPI_RATES = ("current_per", "per_delta_pp")
+
+
+def rate_scale(unit: str) -> float:
+    if unit not in RATE_SCALES:
+        raise RuntimeError(f"Unknown rate unit {unit!r}; expected one of {', '.join(RATE_SCALES)}.")
+    return RATE_SCALES[unit]
+
+
+def _resolve_column(df: pd.DataFrame, name: str) -> str | None:
+    # Exact name, else a single column containing it (e.g. ".00 per_rate" from a spreadsheet export)
+    if name in df.columns:
+        return name
+    candidates = [c for c in df.columns if name in str(c).lower()]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def _naive_utc(s: pd.Series) -> pd.Series:
+    s = pd.to_datetime(s)
+    if s.dt.tz is not None:
+        s = s.dt.tz_convert("UTC").dt.tz_localize(None)
+    return s
+
+
+def _convert(s: pd.Series, kind: str, scale: float) -> pd.Series:
+    if kind == "datetime":
+        return _naive_utc(s)
+    if kind == "region":
+        return s.astype("category")
+    values = pd.to_numeric(s, errors="coerce").to_numpy(dtype="float64")
+    if kind == "rate":
+        return pd.Series((values * scale).astype(np.float32), index=s.index)
+    return pd.Series(values.astype(kind), index=s.index)
+
+
+def normalize(table: str, df: pd.DataFrame, rate_unit: str | None = None) -> pd.DataFrame:
+    """
+    df with every schema column of `table` present (renamed from a fuzzy match if needed) and converted;
+    other columns pass through. `rate_unit` is how this table stores its rates (required if it has any).
+    Raises RuntimeError if a schema column is missing.
+    """
+    schema = SCHEMAS[table]
+    if "rate" in schema.values() and rate_unit is None:
+        raise RuntimeError(f"No rate unit declared for {table}.")
+    scale = rate_scale(rate_unit) if rate_unit is not None else 1.0
+    renames = {}
+    for name in schema:
+        found = _resolve_column(df, name)
+        if found is None:
+            raise RuntimeError(f"{table} has no column {name!r}. Columns: {', '.join(map(str, df.columns))}")
+        if found != name:
+            renames[found] = name
+    out = df.rename(columns=renames) if renames else df.copy()
+    for name, kind in schema.items():
+        out[name] = _convert(out[name], kind, scale)
+    return out
+
+
+def normalize_kpi(kpi: dict, rate_unit: str) -> dict:
+    """A backend KPI dict (dashboard_kpi) with current_per and per_delta_pp in percent (rate_unit: the PER table's)."""
+    scale = rate_scale(rate_unit)
+    return {k: v * scale if k in _KPI_RATES else v for k, v in kpi.items()}
@@ -0,0 +1,64 @@
+"""
+Single-flight call coalescing.
+Concurrent calls with the same key share one execution: the first caller runs it, the rest wait for its
+result or exception. Nothing is cached once the call finishes; later calls run again. Whether a thread's
+latest call ran or joined is kept per thread (shared()), so it is known even when the call raised.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Shared results are the same object for every caller: treat them as read-only."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self._stats = {"executed": 0, "coalesced": 0, "errors": 0, "in_flight": 0}
+        self._local = threading.local()
+
+    def do(self, key, fn, *args, **kwargs) -> tuple[object, bool]:
+        """Run fn(*args, **kwargs) unless a call with `key` is in flight. Returns (value, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+                self._stats["in_flight"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        self._local.shared = not leader
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn(*args, **kwargs)
+            return call.value, False
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self._stats["in_flight"] -= 1
+                self._stats["errors"] += call.error is not None
+            call.done.set()
+
+    def shared(self) -> bool:
+        """Whether this thread's latest do() joined a call in flight (also after it raised the shared error)."""
+        return getattr(self._local, "shared", False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
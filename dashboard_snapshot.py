@@ -0,0 +1,113 @@
+"""
+On-disk snapshots of fetched gold tables for warm starts.
+Each table is written as an uncompressed Arrow IPC file (memory-mapped on read) named by table, scope
+(backend, catalog.schema) and column schema, with the write time in the file metadata. Files with missing
+columns, older than SNAP_SNAPSHOT_MAX_AGE_SECONDS or from an older format are ignored and removed.
+Needs pyarrow; without it snapshots are silently disabled.
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from dashboard_fetch import arrow_to_frame
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow ships with databricks-sql-connector
+    pa = None
+
+SNAPSHOT_DIR = os.getenv("SNAP_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "snap-snapshots"))
+MAX_AGE_SECONDS = float(os.getenv("SNAP_SNAPSHOT_MAX_AGE_SECONDS", "86400"))
+
+_FORMAT = 2  # 2: frames are stored normalized (dashboard_schema)
+_META_KEY = b"snap.snapshot"
+
+
+def _short_hash(value) -> str:
+    return hashlib.blake2b(repr(value).encode(), digest_size=6).hexdigest()
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class TableSnapshot:
+    """
+    Last fetched rows of one table. `scope()` names where the rows came from; a snapshot written under a
+    different scope is never served. `required` columns must all be present for a file to be used.
+    """
+
+    def __init__(self, table: str, scope, required: tuple[str, ...] = (), directory: str = SNAPSHOT_DIR,
+                 max_age_seconds: float = MAX_AGE_SECONDS):
+        self.table = table
+        self._scope = scope
+        self._required = required
+        self._directory = directory
+        self._max_age_seconds = max_age_seconds
+        self._stats = {"loads": 0, "saves": 0, "discarded": 0, "errors": 0}
+
+    def _prefix(self) -> str:
+        return os.path.join(self._directory, f"{self.table}-{_short_hash(self._scope())}")
+
+    def _paths(self) -> list[str]:
+        return glob.glob(f"{self._prefix()}-*.arrow")
+
+    def _usable(self, table, meta: dict) -> bool:
+        return (
+            meta.get("format") == _FORMAT
+            and meta.get("table") == self.table
+            and meta.get("scope") == self._scope()
+            and time.time() - meta.get("written_at", 0) < self._max_age_seconds
+            and all(c in table.schema.names for c in self._required)
+        )
+
+    def load(self) -> pd.DataFrame | None:
+        """The newest usable snapshot as a DataFrame, or None; unusable files are deleted."""
+        if pa is None:
+            return None
+        for path in sorted(self._paths(), key=os.path.getmtime, reverse=True):
+            try:
+                with pa.memory_map(path) as source:
+                    table = pa.ipc.open_file(source).read_all()
+                    meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+                    if self._usable(table, meta):
+                        self._stats["loads"] += 1
+                        return arrow_to_frame(table)
+            except Exception:
+                self._stats["errors"] += 1
+            self._stats["discarded"] += 1
+            _remove_quietly(path)
+        return None
+
+    def save(self, df: pd.DataFrame) -> None:
+        """Replace the table's snapshot with df (atomic rename); failures only count in stats()."""
+        if pa is None:
+            return
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            meta = {"format": _FORMAT, "table": self.table, "scope": self._scope(), "written_at": time.time()}
+            table = table.replace_schema_metadata({_META_KEY: json.dumps(meta).encode()})
+            os.makedirs(self._directory, exist_ok=True)
+            schema = [(f.name, str(f.type)) for f in table.schema]
+            path = f"{self._prefix()}-{_short_hash(schema)}.arrow"
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, path)
+            for old in self._paths():
+                if old != path:
+                    _remove_quietly(old)
+            self._stats["saves"] += 1
+        except Exception:
+            self._stats["errors"] += 1
+
+    def stats(self) -> dict:
+        return dict(self._stats)
@@ -0,0 +1,66 @@
+"""
+Startup timing for the app process.
+Phases (imports, backend resolution, auth, first render) are recorded once per process, relative to the
+first import of this module at the top of app.py, and returned by startup_report(). The report is logged
+as one JSON line on the "snap.startup" logger when the first render finishes. Standard library only, so
+it can be imported before anything heavy.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+_origin = time.perf_counter()
+_phases: dict[str, tuple[float, float]] = {}  # name -> (start, end) in perf_counter seconds
+_lock = threading.Lock()
+_logger = logging.getLogger("snap.startup")
+_reported = False
+
+
+def _record(name: str, start: float, end: float) -> None:
+    with _lock:
+        _phases.setdefault(name, (start, end))
+
+
+@contextmanager
+def phase(name: str):
+    """Time a startup step; only its first run in the process is recorded (later reruns are free)."""
+    if name in _phases:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, start, time.perf_counter())
+
+
+def mark(name: str) -> None:
+    """Record an instant (e.g. "first_data") on the startup timeline."""
+    now = time.perf_counter()
+    _record(name, now, now)
+
+
+def startup_report() -> dict:
+    """{"elapsed_ms": ms since app start, "phases": [{name, start_ms, duration_ms}] ordered by start}."""
+    with _lock:
+        phases = sorted(_phases.items(), key=lambda item: item[1][0])
+    return {
+        "elapsed_ms": round((time.perf_counter() - _origin) * 1000, 1),
+        "phases": [
+            {"name": name, "start_ms": round((start - _origin) * 1000, 1), "duration_ms": round((end - start) * 1000, 1)}
+            for name, (start, end) in phases
+        ],
+    }
+
+
+def finish() -> None:
+    """Mark the first render as done and log the report; no-op after the first call."""
+    global _reported
+    mark("first_render_done")
+    with _lock:
+        if _reported:
+            return
+        _reported = True
+    _logger.info(json.dumps({"startup": startup_report()}))
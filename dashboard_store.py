@@ -0,0 +1,288 @@
+"""
+Region-partitioned in-memory store for the gold time series.
+Each table is loaded once for all regions into a frame indexed by (region, month_start); any region,
+including "All", is then a local slice with no warehouse round trip. Refreshes fetch only rows past the
+month_start watermarks (minus a lookback window for restatements). With a snapshot, a fresh process
+serves the last persisted rows immediately and refreshes from their watermarks in the background.
+"""
+import threading
+import time
+
+import pandas as pd
+
+import dashboard_exec
+from dashboard_trace import annotate, span
+
+ALL = "All"
+
+
+def _regions(s: pd.Series) -> pd.Series:
+    """Region column as a category that includes "All", with NULL regions mapped to it."""
+    s = s.astype("category")
+    if ALL not in s.cat.categories:
+        s = s.cat.add_categories(ALL)
+    return s.fillna(ALL)
+
+
+def aggregate_per_all(df: pd.DataFrame) -> pd.DataFrame:
+    """Statewide PER by month: dollar totals summed, per_rate weighted by issued benefits."""
+    weighted = df.assign(_w=df["per_rate"] * df["issued_benefits_usd"])
+    g = weighted.groupby("month_start", sort=True)
+    out = g[["overpayment_usd", "issued_benefits_usd", "_w"]].sum()
+    mean_rate = g["per_rate"].mean()
+    out["per_rate"] = (out["_w"] / out["issued_benefits_usd"]).where(out["issued_benefits_usd"] > 0, mean_rate)
+    return out.drop(columns="_w")[["per_rate", "overpayment_usd", "issued_benefits_usd"]].reset_index()
+
+
+def aggregate_latency_all(df: pd.DataFrame) -> pd.DataFrame:
+    """Statewide latency by period. The table has no case counts, so each region weighs equally."""
+    g = df.groupby("month_start", sort=True)
+    return g[["median_latency_days", "p90_latency_days"]].mean().reset_index()
+
+
+class RegionStore:
+    """
+    One gold table held in memory for all regions. `loader(since)` returns every row (all regions) with
+    month_start >= since, or the whole table for since=None; `loader(since, region)` only that region's
+    rows ("All": the statewide rows). Rows with a NULL/"All" region are treated as statewide, otherwise
+    "All" is built with `aggregate_all`.
+
+    After ttl_seconds() or invalidate() the store refreshes incrementally from per-region month_start
+    watermarks, each minus lookback_days (to pick up restated periods). Regions within lookback_days of
+    the newest watermark share one table-wide fetch from the newest watermark minus lookback_days; each
+    region lagging behind that (late data, a retired region) is fetched on its own from its own watermark,
+    so late rows for it are picked up without widening the table-wide window. Each region's window is then
+    replaced in the cached rows. Regions that first appear with rows older than the table-wide window
+    need a full reload: first use, schema change, or refresh(full=True) / invalidate(full=True).
+    Fetching happens outside the read lock and the new frame is swapped in atomically; one load runs at a
+    time and callers that queued behind it reuse its result. With background=True reads never wait for a
+    refresh: a due refresh is submitted to the query executor and the current rows are served meanwhile.
+
+    With a `snapshot` (dashboard_snapshot.TableSnapshot), every load is persisted, and first use in a new
+    process serves the snapshot and submits an incremental refresh instead of blocking on a full load.
+    """
+
+    def __init__(
+        self, loader, aggregate_all, ttl_seconds, lookback_days: float = 35, snapshot=None, background: bool = False
+    ):
+        self._loader = loader
+        self._aggregate_all = aggregate_all
+        self._ttl_seconds = ttl_seconds
+        self._lookback = pd.Timedelta(days=lookback_days)
+        self._lock = threading.Lock()  # guards the state below; never held while fetching
+        self._load_lock = threading.Lock()  # single-flight: one load at a time
+        self._raw: pd.DataFrame | None = None  # rows as fetched, without synthesized "All" rows
+        self._frame: pd.DataFrame | None = None
+        self._slices: dict[str, pd.DataFrame] = {}
+        self._watermarks: dict[str, pd.Timestamp] = {}
+        self._loaded_at = float("-inf")
+        self._stale = False
+        self._epoch = 0  # bumped by invalidate(); a load started in an older epoch is not installed
+        self._background = background
+        self._snapshot = snapshot
+        self._warm_tried = snapshot is None
+        self._stats = {
+            "full_loads": 0, "incremental_loads": 0, "warm_starts": 0, "coalesced": 0, "discarded_loads": 0,
+            "background_refreshes": 0, "rows_fetched": 0, "slices": 0, "slice_hits": 0,
+        }
+
+    @staticmethod
+    def _prepare(raw: pd.DataFrame) -> pd.DataFrame:
+        return raw.assign(region=_regions(raw["region"]))
+
+    def _build(self, raw: pd.DataFrame) -> pd.DataFrame:
+        if not raw.empty and not (raw["region"] == ALL).any():
+            statewide = self._aggregate_all(raw).assign(region=ALL)
+            # Same dtypes as the fetched rows (float32 rates, categorical region), so the concat keeps them
+            raw = pd.concat([raw, statewide[raw.columns].astype(raw.dtypes.to_dict())], ignore_index=True)
+        return raw.set_index(["region", "month_start"], drop=False).sort_index()
+
+    def _window_locked(self) -> tuple[pd.Timestamp, dict[str, pd.Timestamp]] | None:
+        """(table-wide since, {lagging region: its own since}), or None when there is nothing to refresh from."""
+        if not self._watermarks:
+            return None
+        since = max(self._watermarks.values()) - self._lookback
+        lagging = {r: w - self._lookback for r, w in self._watermarks.items() if w - self._lookback < since}
+        return since, lagging
+
+    def _fetch_window(self, since: pd.Timestamp, lagging: dict[str, pd.Timestamp]) -> pd.DataFrame:
+        fetched = self._prepare(self._loader(since))
+        if not lagging:
+            return fetched
+        # A lagging region's own query also returns its rows inside the table-wide window; take them from there.
+        parts = [fetched[~fetched["region"].isin(list(lagging))]]
+        parts += [self._prepare(self._loader(region_since, region)) for region, region_since in lagging.items()]
+        merged = pd.concat([p for p in parts if not p.empty] or parts[:1], ignore_index=True)
+        return merged.assign(region=_regions(merged["region"]))
+
+    @staticmethod
+    def _merge(
+        base: pd.DataFrame, fetched: pd.DataFrame, since: pd.Timestamp, lagging: dict[str, pd.Timestamp]
+    ) -> pd.DataFrame | None:
+        """Replace each region's [since, ...) window of base (lagging regions: their own); None on schema change."""
+        if list(fetched.columns) != list(base.columns):
+            return None
+        months = pd.to_datetime(base["month_start"])
+        cutoff = pd.Series(since, index=base.index)
+        if lagging:
+            own = pd.to_datetime(base["region"].astype(object).map(lagging))
+            cutoff = own.fillna(since)
+        keep = base[months < cutoff]
+        if keep.empty:
+            return fetched
+        if fetched.empty:
+            return keep
+        merged = pd.concat([keep, fetched], ignore_index=True)
+        return merged.assign(region=_regions(merged["region"]))
+
+    def _install_locked(self, raw: pd.DataFrame, frame: pd.DataFrame) -> None:
+        self._raw = raw
+        self._frame = frame
+        self._slices = {}
+        months = pd.to_datetime(raw["month_start"])
+        self._watermarks = months.groupby(raw["region"]).max().to_dict() if not raw.empty else {}
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    def _load(self, full: bool, requested_at: float) -> None:
+        """
+        Fetch and swap in new rows; skipped if another load finished after requested_at. A load overlapping
+        invalidate() is discarded, and retried when there are no rows to serve yet.
+        """
+        with self._load_lock:
+            while True:
+                with self._lock:
+                    if self._loaded_at >= requested_at and not self._stale:
+                        self._stats["coalesced"] += 1
+                        return
+                    base, epoch = self._raw, self._epoch
+                    window = None if full or base is None else self._window_locked()
+                since, lagging = window if window is not None else (None, {})
+                with span("store.load") as sp:
+                    if since is None:
+                        fetched = self._prepare(self._loader(None))
+                    else:
+                        fetched = self._fetch_window(since, lagging)
+                    rows_fetched = len(fetched)
+                    raw = fetched if since is None else self._merge(base, fetched, since, lagging)
+                    if raw is None:  # schema change: the window cannot be merged, reload everything
+                        since = None
+                        raw = self._prepare(self._loader(None))
+                        rows_fetched += len(raw)
+                    frame = self._build(raw)
+                    sp.set(mode="full" if since is None else "incremental", rows=len(raw), lagging_regions=len(lagging))
+                with self._lock:
+                    self._stats["rows_fetched"] += rows_fetched
+                    if epoch != self._epoch:  # invalidated mid-fetch: these rows may predate the change
+                        self._stats["discarded_loads"] += 1
+                        if self._frame is not None:
+                            return  # serve the current rows; the next read refreshes (the store is stale)
+                        continue  # nothing to serve yet: load again for the new epoch
+                    self._stats["full_loads" if since is None else "incremental_loads"] += 1
+                    self._install_locked(raw, frame)
+                if self._snapshot is not None:
+                    self._snapshot.save(raw)
+                return
+
+    def _warm_start(self) -> bool:
+        """Install the persisted snapshot (once per store) and refresh behind it; False if there is none."""
+        with self._load_lock:
+            if self._warm_tried:
+                return self._frame is not None
+            self._warm_tried = True
+            with span("store.warm_start") as sp:
+                raw = self._snapshot.load()
+                sp.set(hit=raw is not None)
+            if raw is None:
+                return False
+            raw = self._prepare(raw)
+            frame = self._build(raw)
+            with self._lock:
+                self._install_locked(raw, frame)
+                self._stats["warm_starts"] += 1
+        dashboard_exec.submit(self.refresh)
+        return True
+
+    def _refresh_in_background(self) -> None:
+        if self._load_lock.locked():
+            return  # a load is already running; its result will be served
+        with self._lock:
+            self._stats["background_refreshes"] += 1
+        dashboard_exec.submit(self.refresh)
+
+    def _current(self) -> pd.DataFrame:
+        with self._lock:
+            frame = self._frame
+            due = frame is not None and (self._stale or time.monotonic() - self._loaded_at >= self._ttl_seconds())
+        if frame is None:
+            if not self._warm_start():
+                self._load(full=True, requested_at=time.monotonic())
+        elif due:
+            if self._background:
+                self._refresh_in_background()
+                return frame
+            self._load(full=False, requested_at=time.monotonic())
+        with self._lock:
+            return self._frame
+
+    def refresh(self, full: bool = False) -> None:
+        """
+        Refresh now: incrementally from the watermarks, or a full reload when full=True. An empty store
+        warm-starts from its snapshot first when it has one (prefetch).
+        """
+        requested_at = time.monotonic()
+        if not full and self._frame is None and self._warm_start():
+            return
+        self._load(full=full, requested_at=requested_at)
+
+    def frame(self, region: str | None = None) -> pd.DataFrame:
+        """Rows for one region (None/"All" = statewide), ordered by month_start. Treat as read-only."""
+        key = region or ALL
+        frame = self._current()
+        with self._lock:
+            cached = self._slices.get(key)
+            if cached is not None:
+                self._stats["slice_hits"] += 1
+                annotate(cache="hit")
+                return cached
+        annotate(cache="miss")
+        if key in frame.index.get_level_values(0):
+            part = frame.loc[key].reset_index(drop=True)
+        else:
+            part = frame.iloc[0:0].reset_index(drop=True)
+        with self._lock:
+            if self._frame is frame:
+                self._slices[key] = part
+            self._stats["slices"] += 1
+        return part
+
+    def frames(self, regions: list[str]) -> pd.DataFrame:
+        """Rows for several regions in one slice, ordered by (region, month_start); unknown regions are skipped."""
+        frame = self._current()
+        annotate(regions=len(regions))
+        return frame[frame.index.get_level_values(0).isin(regions)].reset_index(drop=True)
+
+    def regions(self) -> list[str]:
+        """Non-statewide regions present in the table, sorted."""
+        regions = self._current().index.get_level_values(0).unique()
+        return sorted(r for r in regions if r != ALL)
+
+    def invalidate(self, full: bool = False) -> None:
+        """Mark the table stale; the next read refreshes incrementally (or reloads fully if full=True)."""
+        with self._lock:
+            self._epoch += 1
+            self._stale = True
+            if full:
+                self._raw = None
+                self._frame = None
+                self._slices = {}
+                self._watermarks = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = 0 if self._frame is None else len(self._frame)
+            watermarks = {r: str(w.date()) for r, w in self._watermarks.items()}
+            stats = {**self._stats, "rows": rows, "watermarks": watermarks}
+        if self._snapshot is not None:
+            stats["snapshot"] = self._snapshot.stats()
+        return stats
@@ -0,0 +1,179 @@
+"""
+Lightweight tracing for the dashboard hot path.
+Spans record wall time plus attributes (rows, bytes, cache hit/miss, query fingerprint) and are grouped
+per render; each finished render is logged as one JSON line on the "snap.trace" logger and kept for the
+sidebar diagnostics panel. Off unless SNAP_TRACE=true: disabled spans are a shared no-op object and
+traced functions cost one flag check.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+from collections import deque
+
+_enabled = os.getenv("SNAP_TRACE", "false").lower() == "true"
+
+_logger = logging.getLogger("snap.trace")
+_current_span: contextvars.ContextVar = contextvars.ContextVar("snap_span", default=None)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("snap_trace", default=None)
+_recent: deque = deque(maxlen=int(os.getenv("SNAP_TRACE_KEEP", "20")))
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(on: bool) -> None:
+    global _enabled
+    _enabled = on
+    if on and not _logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+
+
+class _NoopSpan:
+    __slots__ = ()
+    attrs: dict = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "parent", "start", "duration_ms", "_token", "_spans")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.start = 0.0
+        self.duration_ms = 0.0
+        self._token = None
+        self._spans = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent = parent.name if parent is not None else None
+        self._spans = _current_trace.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        if self._spans is not None:
+            self._spans.append(self)  # list.append is atomic, so worker threads can report here
+        return False
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def as_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "ms": round(self.duration_ms, 2),
+            **self.attrs,
+        }
+
+
+def span(name: str, **attrs):
+    """Context manager timing a block; a shared no-op when tracing is off."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def annotate(**attrs) -> None:
+    """Attach attributes (e.g. cache="hit") to the innermost open span, if any."""
+    if _enabled:
+        current = _current_span.get()
+        if current is not None:
+            current.attrs.update(attrs)
+
+
+def frame_attrs(value) -> dict:
+    """rows/bytes for DataFrame-like results; empty for anything else."""
+    if hasattr(value, "memory_usage") and hasattr(value, "__len__"):
+        return {"rows": len(value), "bytes": int(value.memory_usage(index=False).sum())}
+    return {}
+
+
+def traced(name: str):
+    """Decorator: run the function inside span(name), recording rows/bytes of a returned frame."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, {}) as sp:
+                result = fn(*args, **kwargs)
+                sp.attrs.update(frame_attrs(result))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+class _RenderTrace:
+    def __init__(self, name: str = "render"):
+        self._name = name
+        self._root = None
+        self._tokens = None
+
+    def __enter__(self):
+        if not _enabled:
+            return _NOOP
+        spans: list = []
+        self._tokens = _current_trace.set(spans)
+        self._root = _Span(self._name, {}).__enter__()
+        return self._root
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._root is None:
+            return False
+        root = self._root
+        root.__exit__(exc_type, exc, tb)
+        spans = _current_trace.get()
+        _current_trace.reset(self._tokens)
+        record = {
+            "trace": self._name,
+            "total_ms": round(root.duration_ms, 2),
+            "spans": [s.as_dict(root.start) for s in sorted(spans, key=lambda s: s.start)],
+        }
+        _recent.append(record)
+        _logger.info(json.dumps(record, default=str))
+        return False
+
+
+def render_trace(name: str = "render") -> _RenderTrace:
+    """Root span for one page render; on exit the collected spans are logged and kept for diagnostics."""
+    return _RenderTrace(name)
+
+
+def recent_renders() -> list[dict]:
+    """Most recent finished render traces, oldest first."""
+    return list(_recent)
+
+
+if _enabled:
+    set_enabled(True)
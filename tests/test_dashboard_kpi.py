@@ -0,0 +1,67 @@
+"""
+kpi_summary: the one-query KPIs match kpi_from_frames over the series the charts show, for one region and
+for "All" (per-period statewide folds, or the table's own statewide rows). Runs the warehouse SQL on DuckDB
+through dashboard_data_local.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dashboard_data_local as local  # noqa: E402
+from dashboard_data_real import ConnectionPool  # noqa: E402
+from dashboard_kpi import kpi_from_frames  # noqa: E402
+from dashboard_store import aggregate_per_all  # noqa: E402
+
+
+def _with_statewide_rows(tables: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Add NULL-region statewide rows that differ from any fold of the region rows."""
+    per, latency = tables["gold_snap_per_timeseries"], tables["gold_income_latency_timeseries"]
+    per_all = per.groupby("month_start", as_index=False)[["overpayment_usd", "issued_benefits_usd"]].sum()
+    per_all = per_all.assign(region=None, per_rate=0.05)
+    lat_all = latency.groupby("week_start", as_index=False)[["median_latency_days", "p90_latency_days"]].max()
+    lat_all = lat_all.assign(region=None)
+    return {
+        **tables,
+        "gold_snap_per_timeseries": pd.concat([per, per_all[per.columns]], ignore_index=True),
+        "gold_income_latency_timeseries": pd.concat([latency, lat_all[latency.columns]], ignore_index=True),
+    }
+
+
+@pytest.fixture(params=[False, True], ids=["region-rows", "statewide-rows"])
+def backend(request, tmp_path, monkeypatch):
+    tables = local.synthetic_tables(regions=4, years=1, seed=3)
+    if request.param:
+        tables = _with_statewide_rows(tables)
+    local.write_snapshots(tables, str(tmp_path))
+    monkeypatch.setattr(local, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(local, "_db", None)
+    backend = local.LocalBackend(ConnectionPool(local._connect), local._local_queries())
+    backend.statewide_rows = request.param
+    return backend
+
+
+def _reference(backend, region: str) -> dict:
+    if region != "All":
+        return kpi_from_frames(backend.get_per_timeseries(region), backend.get_income_latency_timeseries(region))
+    per = backend.get_per_timeseries("All")
+    if backend.statewide_rows:
+        per = per[per["region"].isna()].reset_index(drop=True)
+    else:
+        per = aggregate_per_all(per)
+    return kpi_from_frames(per, backend.get_income_latency_timeseries("All"))
+
+
+@pytest.mark.parametrize("region", ["Region 02", "All"])
+def test_kpi_summary_matches_kpi_from_frames(backend, region):
+    got = backend.get_kpi_summary(region)
+    want = _reference(backend, region)
+    assert got.keys() == want.keys()
+    for key, value in want.items():
+        assert got[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
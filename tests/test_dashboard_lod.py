@@ -0,0 +1,96 @@
+"""
+dashboard_lod: decimated series stay within the point budget and keep the points that carry meaning
+(series ends, samples around event markers, threshold crossings).
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard_data_mock import INGESTION_CHANGE_DATE, REMEDIATION_DATE  # noqa: E402
+from dashboard_lod import crossing_indices, decimate, event_indices, lttb_indices  # noqa: E402
+
+THRESHOLD = 6.0
+
+
+def _weekly(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """n weekly samples ending after both marker dates; x in epoch-ms like the chart builders, y around 6%."""
+    weeks = pd.date_range(end="2026-06-01", periods=n, freq="W-MON")
+    x = (weeks.as_unit("ns").asi8 // 1_000_000).astype(float)
+    y = THRESHOLD + np.random.default_rng(seed).normal(0, 0.5, n)
+    return x, y
+
+
+def _event_ms() -> list[float]:
+    return [float(pd.Timestamp(d).value // 1_000_000) for d in (INGESTION_CHANGE_DATE, REMEDIATION_DATE)]
+
+
+@pytest.mark.parametrize("n,max_points", [(5_000, 200), (10_000, 800), (1_000, 100)])
+def test_decimate_stays_within_budget_and_keeps_ends(n, max_points):
+    x, y = _weekly(n)
+    idx = decimate(x, [y], max_points, keep=event_indices(x, _event_ms()), soft_keep=crossing_indices(y, THRESHOLD))
+    assert len(idx) <= max_points
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_decimate_two_series_stays_within_budget():
+    x, median = _weekly(10_000)
+    p90 = median * 2
+    idx = decimate(x, [median, p90], 300, keep=event_indices(x, _event_ms()))
+    assert len(idx) <= 300
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+
+
+def test_decimate_keeps_samples_around_both_markers():
+    x, y = _weekly(5_000)
+    keep = event_indices(x, _event_ms())
+    idx = decimate(x, [y], 200, keep=keep)
+    for event in _event_ms():
+        after = int(np.searchsorted(x, event))
+        assert {after - 1, after} <= set(idx.tolist())
+    assert set(keep.tolist()) <= set(idx.tolist())
+
+
+def test_event_indices_ignore_markers_outside_the_series():
+    x, _ = _weekly(10)  # the last ten weeks, after both markers
+    assert len(event_indices(x, _event_ms())) == 0
+
+
+def test_decimate_thins_crossings_to_half_the_budget():
+    x, y = _weekly(5_000)
+    crossings = crossing_indices(y, THRESHOLD)
+    assert len(crossings) > 100  # noisy series hovering at the threshold
+    idx = decimate(x, [y], 200, soft_keep=crossings)
+    assert len(idx) <= 200
+    kept = np.intersect1d(idx, crossings)
+    assert len(kept) >= 100  # thinned to half the budget, not dropped
+    # spread over the whole series rather than bunched at the start
+    assert kept.min() < len(x) // 10 and kept.max() > len(x) * 9 // 10
+
+
+def test_crossings_keep_both_samples_of_each_crossing():
+    y = np.array([5.0, 5.5, 6.5, 7.0, 5.0])
+    assert crossing_indices(y, THRESHOLD).tolist() == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 50, 200])
+def test_decimate_returns_every_point_within_budget(n):
+    x, y = _weekly(n) if n else (np.empty(0), np.empty(0))
+    idx = decimate(x, [y], 200, keep=event_indices(x, _event_ms()), soft_keep=crossing_indices(y, THRESHOLD))
+    assert idx.tolist() == list(range(n))
+
+
+def test_lttb_preserves_shape_extremes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4_321] = 25.0  # a single spike must survive
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert 4_321 in idx
+    assert np.isclose(y[idx].max(), y.max()) and np.isclose(y[idx].min(), y.min(), atol=0.05)
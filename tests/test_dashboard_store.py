@@ -0,0 +1,106 @@
+"""
+dashboard_store.RegionStore: incremental refreshes pick up late rows and keep the cached rows consistent.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard_store import RegionStore, aggregate_per_all  # noqa: E402
+
+
+class Table:
+    """In-memory gold table behind a RegionStore loader(since, region=None); records each call."""
+
+    def __init__(self, rows: pd.DataFrame):
+        self.rows = rows
+        self.calls: list[tuple] = []
+
+    def add(self, rows: pd.DataFrame) -> None:
+        self.rows = pd.concat([self.rows, rows], ignore_index=True)
+
+    def loader(self, since=None, region=None) -> pd.DataFrame:
+        self.calls.append((since, region))
+        df = self.rows
+        if region is not None:
+            df = df[df["region"] == region]
+        if since is not None:
+            df = df[df["month_start"] >= since]
+        return df.sort_values("month_start").reset_index(drop=True)
+
+
+def _per_rows(region: str, months: str | list[str]) -> pd.DataFrame:
+    months = pd.to_datetime([months] if isinstance(months, str) else months)
+    return pd.DataFrame({
+        "month_start": months,
+        "region": region,
+        "per_rate": 6.0,
+        "overpayment_usd": 60.0,
+        "issued_benefits_usd": 1000.0,
+    })
+
+
+def _store(table: Table) -> RegionStore:
+    return RegionStore(table.loader, aggregate_per_all, ttl_seconds=lambda: 3600, lookback_days=35)
+
+
+def test_incremental_refresh_picks_up_late_rows_for_a_lagging_region():
+    a_months = pd.date_range("2026-01-01", "2026-06-01", freq="MS").strftime("%Y-%m-%d").tolist()
+    table = Table(pd.concat([_per_rows("A", a_months), _per_rows("B", "2026-01-01")], ignore_index=True))
+    store = _store(table)
+    assert len(store.frame("B")) == 1
+
+    table.add(_per_rows("B", ["2026-02-01", "2026-03-01", "2026-04-01"]))
+    store.invalidate()
+    b = store.frame("B")
+
+    assert store.stats()["incremental_loads"] == 1
+    assert pd.to_datetime(b["month_start"]).dt.strftime("%Y-%m").tolist() == [
+        "2026-01", "2026-02", "2026-03", "2026-04",
+    ]
+    assert len(store.frame("A")) == 6
+    # the table-wide window stays at the newest watermark; only B is read from its own
+    assert table.calls[-2:] == [
+        (pd.Timestamp("2026-06-01") - pd.Timedelta(days=35), None),
+        (pd.Timestamp("2026-01-01") - pd.Timedelta(days=35), "B"),
+    ]
+
+
+def test_incremental_refresh_replaces_restated_rows_without_duplicates():
+    table = Table(pd.concat(
+        [_per_rows("A", ["2026-04-01", "2026-05-01", "2026-06-01"]), _per_rows("B", ["2026-05-01", "2026-06-01"])],
+        ignore_index=True,
+    ))
+    store = _store(table)
+    table.rows.loc[table.rows["month_start"] == "2026-06-01", "overpayment_usd"] = 90.0
+    store.invalidate()
+
+    a, b = store.frame("A"), store.frame("B")
+    assert len(a) == 3 and len(b) == 2
+    assert a["overpayment_usd"].tolist() == [60.0, 60.0, 90.0]
+    assert store.frame("All")["overpayment_usd"].tolist() == [60.0, 120.0, 180.0]
+
+
+def test_first_load_overlapping_invalidate_is_retried():
+    table = Table(_per_rows("A", ["2026-05-01", "2026-06-01"]))
+
+    def slow_loader(since=None, region=None):
+        time.sleep(0.2)
+        return table.loader(since, region)
+
+    store = RegionStore(slow_loader, aggregate_per_all, ttl_seconds=lambda: 3600)
+    timer = threading.Timer(0.05, store.invalidate)
+    timer.start()
+    try:
+        a = store.frame("A")
+    finally:
+        timer.join()
+
+    assert len(a) == 2
+    stats = store.stats()
+    assert stats["discarded_loads"] == 1 and stats["full_loads"] == 1